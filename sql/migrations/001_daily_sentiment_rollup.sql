@@ -0,0 +1,57 @@
+-- ============================================================================
+-- Migration 001: daily_sentiment_rollup
+-- Adds the pre-aggregated daily sentiment table used by weekly reports and
+-- backfills it from existing data. Safe to re-run.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS daily_sentiment_rollup (
+    company_id INT NOT NULL,
+    day DATE NOT NULL,
+    article_count INT NOT NULL,
+    avg_sentiment DECIMAL(5,4) NULL,
+    min_sentiment DECIMAL(5,4) NULL,
+    max_sentiment DECIMAL(5,4) NULL,
+    avg_confidence DECIMAL(5,4) NULL,
+    positive_count INT NOT NULL DEFAULT 0,
+    negative_count INT NOT NULL DEFAULT 0,
+    neutral_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (company_id, day),
+
+    FOREIGN KEY (company_id) REFERENCES companies(id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+) ENGINE=InnoDB
+  CHARACTER SET utf8mb4
+  COLLATE utf8mb4_unicode_ci
+  COMMENT='Daily sentiment aggregates per company for report queries';
+
+-- Backfill from all existing articles
+INSERT INTO daily_sentiment_rollup (
+    company_id, day, article_count, avg_sentiment, min_sentiment, max_sentiment,
+    avg_confidence, positive_count, negative_count, neutral_count
+)
+SELECT
+    a.company_id,
+    DATE(a.published_at) AS day,
+    COUNT(a.id),
+    AVG(s.sentiment_score),
+    MIN(s.sentiment_score),
+    MAX(s.sentiment_score),
+    AVG(s.confidence),
+    SUM(CASE WHEN s.sentiment_label = 'positive' THEN 1 ELSE 0 END),
+    SUM(CASE WHEN s.sentiment_label = 'negative' THEN 1 ELSE 0 END),
+    SUM(CASE WHEN s.sentiment_label = 'neutral' THEN 1 ELSE 0 END)
+FROM articles a
+JOIN sentiment_scores s ON a.id = s.article_id
+GROUP BY a.company_id, DATE(a.published_at)
+ON DUPLICATE KEY UPDATE
+    article_count = VALUES(article_count),
+    avg_sentiment = VALUES(avg_sentiment),
+    min_sentiment = VALUES(min_sentiment),
+    max_sentiment = VALUES(max_sentiment),
+    avg_confidence = VALUES(avg_confidence),
+    positive_count = VALUES(positive_count),
+    negative_count = VALUES(negative_count),
+    neutral_count = VALUES(neutral_count);
@@ -0,0 +1,16 @@
+-- ============================================================================
+-- Migration 002: covering indexes for report queries
+-- The weekly, sector and trending reports filter articles on published_at,
+-- join on company_id and aggregate sentiment_scores. These indexes let both
+-- sides be read index-only. Replaced indexes are prefixes of the new ones.
+--
+-- Verify with EXPLAIN on the report queries: articles should show
+-- type=range / Extra=Using index on idx_articles_pub_company.
+-- ============================================================================
+
+CREATE INDEX idx_articles_pub_company ON articles(published_at, company_id, id);
+DROP INDEX idx_published_at ON articles;
+
+CREATE INDEX idx_sent_article_score ON sentiment_scores(article_id, sentiment_score, sentiment_label, confidence);
+DROP INDEX idx_sentiment_article_score ON sentiment_scores;
+DROP INDEX idx_article_sentiment ON sentiment_scores;
@@ -11,6 +11,7 @@
 -- USE sentiment_finance;
 
 -- Drop tables in reverse order of dependencies for clean setup
+DROP TABLE IF EXISTS daily_sentiment_rollup;
 DROP TABLE IF EXISTS sentiment_scores;
 DROP TABLE IF EXISTS articles;
 DROP TABLE IF EXISTS companies;
@@ -70,7 +71,8 @@ CREATE TABLE articles (
         ON UPDATE CASCADE,
 
     -- Indexes for performance
-    INDEX idx_published_at (published_at),
+    -- Covers the published_at range scans + company joins of the reports
+    INDEX idx_articles_pub_company (published_at, company_id, id),
     INDEX idx_company_published (company_id, published_at),
     INDEX idx_source (source),
     INDEX idx_title_fulltext (title),
@@ -111,7 +113,6 @@ CREATE TABLE sentiment_scores (
     INDEX idx_sentiment_score (sentiment_score),
     INDEX idx_sentiment_label (sentiment_label),
     INDEX idx_confidence (confidence),
-    INDEX idx_article_sentiment (article_id, sentiment_score),
     INDEX idx_created_at (created_at),
 
     -- Check constraints for data validation
@@ -123,6 +124,34 @@ CREATE TABLE sentiment_scores (
   COLLATE utf8mb4_unicode_ci
   COMMENT='Sentiment analysis results with confidence metrics';
 
+-- ============================================================================
+-- Table: daily_sentiment_rollup
+-- Pre-aggregated daily sentiment per company, refreshed by the pipeline
+-- ============================================================================
+CREATE TABLE daily_sentiment_rollup (
+    company_id INT NOT NULL,
+    day DATE NOT NULL,
+    article_count INT NOT NULL,
+    avg_sentiment DECIMAL(5,4) NULL,
+    min_sentiment DECIMAL(5,4) NULL,
+    max_sentiment DECIMAL(5,4) NULL,
+    avg_confidence DECIMAL(5,4) NULL,
+    positive_count INT NOT NULL DEFAULT 0,
+    negative_count INT NOT NULL DEFAULT 0,
+    neutral_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (company_id, day),
+
+    -- Foreign key constraints
+    FOREIGN KEY (company_id) REFERENCES companies(id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+) ENGINE=InnoDB
+  CHARACTER SET utf8mb4
+  COLLATE utf8mb4_unicode_ci
+  COMMENT='Daily sentiment aggregates per company for report queries';
+
 -- ============================================================================
 -- Insert sample companies for testing
 -- ============================================================================
@@ -251,8 +280,8 @@ DELIMITER ;
 -- Composite index for time-series queries
 CREATE INDEX idx_articles_company_date_sentiment ON articles(company_id, published_at);
 
--- Index for sentiment analysis queries
-CREATE INDEX idx_sentiment_article_score ON sentiment_scores(article_id, sentiment_score, confidence);
+-- Covering index for sentiment aggregation in report queries
+CREATE INDEX idx_sent_article_score ON sentiment_scores(article_id, sentiment_score, sentiment_label, confidence);
 
 -- ============================================================================
 -- Grant permissions (adjust as needed for your environment)
@@ -4,13 +4,49 @@ Implements clean OOP design for data ingestion.
 """
 
 import os
+import re
+import asyncio
+from collections import OrderedDict, defaultdict
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterable, Iterator
+from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
+# Length of the News API timestamp format 'YYYY-MM-DDTHH:MM:SSZ'
+_ISO_LEN = 20
+
+# Longest combined company query sent as a single News API request
+_MAX_QUERY_LENGTH = 500
+
+# Topic filter appended to every company query
+_COMPANY_QUERY_SUFFIX = ' AND (stock OR market OR business)'
+
+# Concurrent News API requests allowed per aiohttp session; this is also
+# the connection pool size, kept below the sync session's 20 to go easy on
+# the API's rate limit now that company and sector requests share one pool
+_MAX_CONCURRENT_REQUESTS = 10
+
+# Retries for transient News API failures, with exponential backoff in seconds
+_MAX_RETRIES = 3
+_RETRY_BACKOFF = 0.3
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Domain suffix dropped from search terms like "amazon.com" when matching headlines
+_DOMAIN_SUFFIX_RE = re.compile(r'\.(?:com|net|org|io)$')
+
+
+def _clean(s: Optional[str]) -> str:
+    """Strip surrounding whitespace, skipping the copy for already-trimmed strings."""
+    if s and (s[:1].isspace() or s[-1:].isspace()):
+        return s.strip()
+    return s or ''
+
 
 class DataFetcher:
     """Handles fetching news data from various API sources."""
@@ -29,11 +65,178 @@ class DataFetcher:
         if not self.api_key:
             raise ValueError("NEWS_API_KEY must be provided or set in environment")
 
+        # Reuse pooled keep-alive connections and retry transient failures
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=_MAX_RETRIES,
+                backoff_factor=_RETRY_BACKOFF,
+                status_forcelist=_RETRY_STATUSES
+            )
+        )
+        self.session.mount('https://', adapter)
+
+        # Bounded LRU of URLs already returned, shared by company and sector
+        # fetches; callers clear it per run with reset_seen_urls so a warm
+        # instance never drops articles returned by an earlier run
+        self._seen_urls = OrderedDict()
+        self._seen_cap = 50_000
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+
+    def reset_seen_urls(self):
+        """Forget URLs returned so far, starting a new deduplication run."""
+        self._seen_urls.clear()
+
     def fetch_financial_news(self, companies: List[str], hours_back: int = 24) -> List[Dict]:
         """
         Fetch recent financial news for specified companies.
 
+        Synchronous wrapper around fetch_financial_news_async for callers
+        that are not running an event loop (e.g. the Lambda handler).
+
+        Args:
+            companies: List of company names to search for
+            hours_back: How many hours back to fetch news
+
+        Returns:
+            List of article dictionaries
+        """
+        return asyncio.run(self.fetch_financial_news_async(companies, hours_back))
+
+    async def fetch_financial_news_async(self, companies: List[str], hours_back: int = 24) -> List[Dict]:
+        """
+        Fetch recent financial news for specified companies concurrently.
+
+        Args:
+            companies: List of company names to search for
+            hours_back: How many hours back to fetch news
+
+        Returns:
+            List of article dictionaries
+        """
+        async with self._client_session() as session:
+            return await self._fetch_companies_async(session, companies, hours_back)
+
+    def fetch_all_news(self, companies: List[str], sectors: List[str],
+                       hours_back: int = 24) -> List[Dict]:
+        """
+        Fetch company and sector news in one concurrent round.
+
+        Synchronous wrapper around fetch_all_news_async.
+
+        Args:
+            companies: List of company names to search for
+            sectors: List of sector names to search for
+            hours_back: How many hours back to fetch news
+
+        Returns:
+            List of article dictionaries, company articles first
+        """
+        return asyncio.run(self.fetch_all_news_async(companies, sectors, hours_back))
+
+    async def fetch_all_news_async(self, companies: List[str], sectors: List[str],
+                                   hours_back: int = 24) -> List[Dict]:
+        """
+        Fetch company and sector news concurrently over one connection pool.
+
+        Sector results are processed after the company results so that an
+        article returned by both keeps its company attribution.
+
+        Args:
+            companies: List of company names to search for
+            sectors: List of sector names to search for
+            hours_back: How many hours back to fetch news
+
+        Returns:
+            List of article dictionaries, company articles first
+        """
+        async with self._client_session() as session:
+            company_articles, *sector_results = await asyncio.gather(
+                self._fetch_companies_async(session, companies, hours_back),
+                *[self._get_articles_async(session, self._build_sector_params(sector, hours_back))
+                  for sector in sectors],
+                return_exceptions=True
+            )
+
+        articles = []
+        if isinstance(company_articles, Exception):
+            logger.error(f"Error fetching company news: {str(company_articles)}")
+        else:
+            articles.extend(company_articles)
+
+        for sector, raw_articles in zip(sectors, sector_results):
+            if isinstance(raw_articles, Exception):
+                logger.error(f"Error fetching sector news for {sector}: {str(raw_articles)}")
+                continue
+
+            sector_articles = list(self._process_articles(raw_articles, f"sector:{sector}"))
+            logger.info(f"Fetched {len(sector_articles)} articles for {sector} sector")
+            articles.extend(sector_articles)
+
+        return articles
+
+    @staticmethod
+    def _client_session() -> aiohttp.ClientSession:
+        """
+        Create an aiohttp session whose pool bounds concurrent requests.
+
+        Returns:
+            New client session
+        """
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=_MAX_CONCURRENT_REQUESTS))
+
+    async def _get_articles_async(self, session: aiohttp.ClientSession, params: Dict) -> List[Dict]:
+        """
+        Run one News API /everything request.
+
+        Rate-limit and server error responses are retried up to _MAX_RETRIES
+        times with exponential backoff, matching the sync session's adapter.
+
+        Args:
+            session: Shared aiohttp session
+            params: Query parameters
+
+        Returns:
+            Raw article dictionaries from the response
+        """
+        for attempt in range(_MAX_RETRIES + 1):
+            async with session.get(f"{self.base_url}/everything", params=params,
+                                   timeout=aiohttp.ClientTimeout(total=30)) as response:
+                if response.status not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+                    response.raise_for_status()
+                    data = orjson.loads(await response.read())
+                    break
+            logger.warning(f"News API returned {response.status}, retrying (attempt {attempt + 1})")
+            await asyncio.sleep(_RETRY_BACKOFF * 2 ** attempt)
+
+        if data.get('status') != 'ok':
+            raise Exception(f"API error: {data.get('message', 'Unknown error')}")
+
+        return data.get('articles', [])
+
+    async def _fetch_companies_async(self, session: aiohttp.ClientSession,
+                                     companies: List[str], hours_back: int) -> List[Dict]:
+        """
+        Fetch news for several companies over a shared session.
+
+        All companies are first requested with a single combined query and
+        results are attributed client-side. If that query fails or would be
+        too long, per-company requests run in parallel; a failure for one
+        company does not affect the others.
+
         Args:
+            session: Shared aiohttp session
             companies: List of company names to search for
             hours_back: How many hours back to fetch news
 
@@ -42,38 +245,175 @@ class DataFetcher:
         """
         articles = []
 
+        # Companies sharing a search term (e.g. "Apple" and "Apple Inc.")
+        # are fetched once and fanned back out to each original name
+        term_to_names = defaultdict(list)
         for company in companies:
+            term_to_names[self._search_term(company)].append(company)
+        search_terms = list(term_to_names)
+
+        if len(search_terms) > 1 and len(self._batch_query(search_terms)) <= _MAX_QUERY_LENGTH:
             try:
-                company_articles = self._fetch_company_news(company, hours_back)
-                articles.extend(company_articles)
-                logger.info(f"Fetched {len(company_articles)} articles for {company}")
+                return await self._fetch_batch_news(session, term_to_names, hours_back)
             except Exception as e:
-                logger.error(f"Error fetching news for {company}: {str(e)}")
+                logger.warning(f"Batch news query failed, falling back to per-company: {str(e)}")
+
+        results = await asyncio.gather(
+            *[self._fetch_company_news_async(session, term, hours_back) for term in search_terms],
+            return_exceptions=True
+        )
+
+        for term, term_articles in zip(search_terms, results):
+            names = term_to_names[term]
+            if isinstance(term_articles, Exception):
+                logger.error(f"Error fetching news for {', '.join(names)}: {str(term_articles)}")
                 continue
 
-        return self._deduplicate_articles(articles)
+            term_articles = list(term_articles)
+            for name in names:
+                articles.extend(dict(article, company_search_term=name) for article in term_articles)
+                logger.info(f"Fetched {len(term_articles)} articles for {name}")
+
+        return articles
 
-    def _fetch_company_news(self, company: str, hours_back: int) -> List[Dict]:
+    async def _fetch_batch_news(self, session: aiohttp.ClientSession,
+                                term_to_names: Dict[str, List[str]], hours_back: int) -> List[Dict]:
         """
-        Fetch news for a specific company.
+        Fetch news for all search terms with one combined OR query.
+
+        Each article is attributed to every search term found as a whole
+        word in its title or description and emitted once per matching
+        company name. Busier companies can fill the single page, so terms
+        left without any article are re-queried on their own.
 
         Args:
-            company: Company name to search for
+            session: Shared aiohttp session
+            term_to_names: Search terms mapped to the company names using them
             hours_back: Hours to look back for news
 
         Returns:
             List of article dictionaries
         """
+        search_terms = list(term_to_names)
+        params = self._build_company_params(search_terms[0], hours_back)
+        params['q'] = self._batch_query(search_terms)
+        params['pageSize'] = 100
+        raw_articles = await self._get_articles_async(session, params)
+
+        # Headlines say "Amazon", not "amazon.com"; several terms may share a word
+        word_to_terms = defaultdict(list)
+        for term in search_terms:
+            word_to_terms[_DOMAIN_SUFFIX_RE.sub('', term)].append(term)
+        pattern = re.compile(r'\b(' + '|'.join(map(re.escape, word_to_terms)) + r')\b', re.IGNORECASE)
+
+        # Drop unrelated articles before they reach the seen-URL LRU
+        relevant = (
+            a for a in raw_articles
+            if pattern.search(self._match_text(a))
+        )
+
+        articles = []
+        counts = dict.fromkeys(search_terms, 0)
+        for article in self._process_articles(relevant, 'batch'):
+            for word in {m.lower() for m in pattern.findall(self._match_text(article))}:
+                for term in word_to_terms[word]:
+                    counts[term] += 1
+                    articles.extend(dict(article, company_search_term=name) for name in term_to_names[term])
+
+        missing_terms = [term for term, count in counts.items() if not count]
+        results = await asyncio.gather(
+            *[self._fetch_company_news_async(session, term, hours_back) for term in missing_terms],
+            return_exceptions=True
+        )
+        for term, term_articles in zip(missing_terms, results):
+            if isinstance(term_articles, Exception):
+                logger.error(f"Error fetching news for {', '.join(term_to_names[term])}: {str(term_articles)}")
+                continue
+            for article in term_articles:
+                counts[term] += 1
+                articles.extend(dict(article, company_search_term=name) for name in term_to_names[term])
+
+        for term, count in counts.items():
+            for name in term_to_names[term]:
+                logger.info(f"Fetched {count} articles for {name}")
+
+        return articles
+
+    @staticmethod
+    def _batch_query(search_terms: List[str]) -> str:
+        """
+        Build a single News API query covering several search terms.
+
+        Args:
+            search_terms: Normalized company search terms
+
+        Returns:
+            Combined query string
+        """
+        return '(' + ' OR '.join(search_terms) + ')' + _COMPANY_QUERY_SUFFIX
+
+    @staticmethod
+    def _match_text(article: Dict) -> str:
+        """
+        Text used to attribute a batch query article to companies.
+
+        Args:
+            article: Raw or processed article
+
+        Returns:
+            Title and description joined by a newline
+        """
+        return f"{article.get('title') or ''}\n{article.get('description') or ''}"
+
+    async def _fetch_company_news_async(self, session: aiohttp.ClientSession,
+                                        search_term: str, hours_back: int) -> Iterator[Dict]:
+        """
+        Fetch news for a specific company search term.
+
+        Args:
+            session: Shared aiohttp session
+            search_term: Normalized company search term
+            hours_back: Hours to look back for news
+
+        Returns:
+            Iterator over processed article dictionaries
+        """
+        params = self._build_company_params(search_term, hours_back)
+        raw_articles = await self._get_articles_async(session, params)
+
+        return self._process_articles(raw_articles, search_term)
+
+    @staticmethod
+    def _search_term(company: str) -> str:
+        """
+        Normalize a company name to its News API search term.
+
+        Args:
+            company: Company name (e.g. "Apple Inc.")
+
+        Returns:
+            Lowercased main name token (e.g. "apple")
+        """
+        return company.split()[0].lower()
+
+    def _build_company_params(self, search_term: str, hours_back: int) -> Dict:
+        """
+        Build News API query parameters for a company search.
+
+        Args:
+            search_term: Normalized company search term
+            hours_back: Hours to look back for news
+
+        Returns:
+            Query parameter dictionary
+        """
         # Calculate date range
         to_date = datetime.now()
         from_date = to_date - timedelta(hours=hours_back)
 
         # Build query parameters - use broader search for free tier
-        # Extract key terms from company name (e.g., "Apple" from "Apple Inc.")
-        search_term = company.split()[0]  # Get first word (main company name)
-
-        params = {
-            'q': f'{search_term} AND (stock OR market OR business)',
+        return {
+            'q': search_term + _COMPANY_QUERY_SUFFIX,
             'from': from_date.strftime('%Y-%m-%d'),
             'language': 'en',
             'sortBy': 'publishedAt',
@@ -81,49 +421,40 @@ class DataFetcher:
             'apiKey': self.api_key
         }
 
-        response = requests.get(f"{self.base_url}/everything", params=params, timeout=30)
-        response.raise_for_status()
-
-        data = response.json()
-
-        if data.get('status') != 'ok':
-            raise Exception(f"API error: {data.get('message', 'Unknown error')}")
-
-        return self._process_articles(data.get('articles', []), company)
-
-    def _process_articles(self, raw_articles: List[Dict], company: str) -> List[Dict]:
+    def _process_articles(self, raw_articles: Iterable[Dict], company: str) -> Iterator[Dict]:
         """
         Process raw API articles into standardized format.
 
+        Articles whose URL was already returned are skipped before any
+        field is parsed, so duplicates cost a single LRU lookup.
+
         Args:
             raw_articles: Raw articles from API
             company: Company name this search was for
 
-        Returns:
+        Yields:
             Processed articles
         """
-        processed = []
-
         for article in raw_articles:
             # Skip articles without required fields
             if not all([article.get('title'), article.get('publishedAt'), article.get('url')]):
                 continue
 
-            processed_article = {
-                'title': article.get('title', '').strip(),
-                'description': article.get('description', '').strip(),
-                'content': article.get('content', '').strip(),
-                'url': article.get('url').strip(),
-                'source': article.get('source', {}).get('name', 'Unknown'),
-                'published_at': self._parse_date(article.get('publishedAt')),
+            url = _clean(article['url'])
+            if not self._is_new_url(url):
+                continue
+
+            yield {
+                'title': _clean(article['title']),
+                'description': _clean(article.get('description')),
+                'content': _clean(article.get('content')),
+                'url': url,
+                'source': (article.get('source') or {}).get('name', 'Unknown'),
+                'published_at': self._parse_date(article['publishedAt']),
                 'company_search_term': company,
-                'author': article.get('author', '').strip() if article.get('author') else None
+                'author': _clean(article.get('author')) or None
             }
 
-            processed.append(processed_article)
-
-        return processed
-
     def _parse_date(self, date_str: str) -> datetime:
         """
         Parse ISO date string to datetime object.
@@ -134,6 +465,17 @@ class DataFetcher:
         Returns:
             Parsed datetime object
         """
+        # Fast path for the fixed-width UTC format News API emits
+        if len(date_str) == _ISO_LEN and date_str[-1] == 'Z':
+            try:
+                return datetime(
+                    int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                    int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+                    tzinfo=timezone.utc
+                )
+            except ValueError:
+                pass
+
         try:
             # Handle timezone info by removing it (News API uses UTC)
             if date_str.endswith('Z'):
@@ -143,26 +485,28 @@ class DataFetcher:
             logger.warning(f"Could not parse date: {date_str}")
             return datetime.now()
 
-    def _deduplicate_articles(self, articles: List[Dict]) -> List[Dict]:
+    def _is_new_url(self, url: str) -> bool:
         """
-        Remove duplicate articles based on URL.
+        Record a URL in the seen-URL LRU.
+
+        URLs are remembered across fetch calls until reset_seen_urls, so
+        articles already returned by another company or sector search are
+        dropped.
 
         Args:
-            articles: List of articles
+            url: Article URL
 
         Returns:
-            Deduplicated articles
+            True if the URL had not been seen before
         """
-        seen_urls = set()
-        unique_articles = []
-
-        for article in articles:
-            url = article.get('url')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_articles.append(article)
+        if url in self._seen_urls:
+            self._seen_urls.move_to_end(url)
+            return False
 
-        return unique_articles
+        self._seen_urls[url] = None
+        if len(self._seen_urls) > self._seen_cap:
+            self._seen_urls.popitem(last=False)
+        return True
 
     def fetch_sector_news(self, sector: str, hours_back: int = 24) -> List[Dict]:
         """
@@ -175,32 +519,45 @@ class DataFetcher:
         Returns:
             List of article dictionaries
         """
-        to_date = datetime.now()
-        from_date = to_date - timedelta(hours=hours_back)
-
-        params = {
-            'q': f'{sector} AND (stock OR market)',
-            'from': from_date.strftime('%Y-%m-%d'),
-            'language': 'en',
-            'sortBy': 'publishedAt',
-            'pageSize': 10,  # Limit results
-            'apiKey': self.api_key
-        }
+        params = self._build_sector_params(sector, hours_back)
 
         try:
-            response = requests.get(f"{self.base_url}/everything", params=params, timeout=30)
+            response = self.session.get(f"{self.base_url}/everything", params=params, timeout=30)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
 
             if data.get('status') != 'ok':
                 raise Exception(f"API error: {data.get('message', 'Unknown error')}")
 
-            articles = self._process_articles(data.get('articles', []), f"sector:{sector}")
+            articles = list(self._process_articles(data.get('articles', []), f"sector:{sector}"))
             logger.info(f"Fetched {len(articles)} articles for {sector} sector")
 
             return articles
 
         except Exception as e:
             logger.error(f"Error fetching sector news for {sector}: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    def _build_sector_params(self, sector: str, hours_back: int) -> Dict:
+        """
+        Build News API query parameters for a sector search.
+
+        Args:
+            sector: Sector name to search for
+            hours_back: Hours to look back for news
+
+        Returns:
+            Query parameter dictionary
+        """
+        to_date = datetime.now()
+        from_date = to_date - timedelta(hours=hours_back)
+
+        return {
+            'q': f'{sector} AND (stock OR market)',
+            'from': from_date.strftime('%Y-%m-%d'),
+            'language': 'en',
+            'sortBy': 'publishedAt',
+            'pageSize': 10,  # Limit results
+            'apiKey': self.api_key
+        }
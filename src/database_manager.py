@@ -5,18 +5,39 @@ Implements complex queries, JOINs, and database operations.
 
 import os
 import logging
-from typing import List, Dict, Optional, Tuple, Any
-from datetime import datetime, timedelta
-import mysql.connector
-from mysql.connector import Error
+from typing import List, Dict, Optional, Tuple, Any, Iterator, Union
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from mysql.connector import Error, pooling
 from contextlib import contextmanager
+from pybloom_live import ScalableBloomFilter
 
 logger = logging.getLogger(__name__)
 
+# Rows pulled per round-trip when streaming report results
+_STREAM_FETCH_SIZE = 1000
+
+# Rows per multi-row INSERT and URLs per IN lookup in the bulk methods
+_BULK_CHUNK_SIZE = 1000
+
+# Share of the server's max_allowed_packet one multi-row INSERT may fill
+_PACKET_BUDGET = 0.8
+
+# Estimated bytes per row for quoting and separators, and per non-string value
+_ROW_OVERHEAD_BYTES = 64
+_VALUE_BYTES = 32
+
+# Report results kept per instance; entries are keyed by the current date too
+_REPORT_CACHE_SIZE = 128
+
 
 class DatabaseManager:
     """Manages all database operations with MySQL RDS."""
 
+    __slots__ = ('host', 'port', 'database', 'user', 'password', 'pool_size', '_pool',
+                 '_max_packet', '_company_id_cache', '_report_cache', 'url_bloom',
+                 '_url_bloom_warm')
+
     def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
                  database: Optional[str] = None, user: Optional[str] = None,
                  password: Optional[str] = None):
@@ -35,23 +56,40 @@ class DatabaseManager:
         self.database = database or os.getenv('DB_NAME')
         self.user = user or os.getenv('DB_USER')
         self.password = password or os.getenv('DB_PASSWORD')
+        self.pool_size = int(os.getenv('DB_POOL_SIZE', '10'))
+        self._pool = None
+        self._max_packet = None
+
+        # Company rows are append-only during a run, so name -> ID is memoized
+        self._company_id_cache: Dict[str, int] = {}
+
+        # LRU of report results keyed by arguments and today's date, so entries
+        # expire at midnight; writes committed through this instance clear it
+        self._report_cache = OrderedDict()
+
+        # URLs known to be stored; a miss means the URL is new once warmed up
+        self.url_bloom = ScalableBloomFilter(initial_capacity=100_000, error_rate=1e-4)
+        self._url_bloom_warm = False
 
         # Validate required connection parameters
         required_params = [self.host, self.database, self.user, self.password]
         if not all(required_params):
             raise ValueError("All database connection parameters must be provided")
 
-    @contextmanager
-    def get_connection(self):
+    def _get_pool(self) -> pooling.MySQLConnectionPool:
         """
-        Context manager for database connections.
+        Get the connection pool, creating it on first use.
 
-        Yields:
-            MySQL connection object
+        The pool opens its connections when created, so it is deferred until
+        a query is actually issued.
+
+        Returns:
+            MySQL connection pool
         """
-        connection = None
-        try:
-            connection = mysql.connector.connect(
+        if self._pool is None:
+            self._pool = pooling.MySQLConnectionPool(
+                pool_name='sf',
+                pool_size=self.pool_size,
                 host=self.host,
                 port=self.port,
                 database=self.database,
@@ -61,6 +99,19 @@ class DatabaseManager:
                 charset='utf8mb4',
                 use_unicode=True
             )
+        return self._pool
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Context manager for pooled database connections.
+
+        Yields:
+            MySQL connection object
+        """
+        connection = None
+        try:
+            connection = self._get_pool().get_connection()
             yield connection
         except Error as e:
             logger.error(f"Database connection error: {str(e)}")
@@ -68,9 +119,167 @@ class DatabaseManager:
                 connection.rollback()
             raise
         finally:
-            if connection and connection.is_connected():
+            if connection:
+                # Closing a pooled connection returns it to the pool
                 connection.close()
 
+    @contextmanager
+    def batch_transaction(self):
+        """
+        Context manager running several bulk writes in one transaction.
+
+        Pass the yielded connection to the bulk insert methods; they then
+        leave committing to this context, which commits once on exit,
+        clearing cached reports, and rolls everything back if the block
+        raises.
+
+        Yields:
+            MySQL connection object
+        """
+        with self.get_connection() as conn:
+            try:
+                yield conn
+                conn.commit()
+                self.invalidate_report_cache()
+            except Exception:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def savepoint(self, connection, name: str = 'batch_row'):
+        """
+        Context manager isolating writes inside a batch_transaction.
+
+        If the block raises, only its own writes are rolled back and the
+        enclosing transaction stays usable; the exception is re-raised.
+
+        Args:
+            connection: Connection of an enclosing batch_transaction
+            name: Savepoint identifier
+
+        Yields:
+            None
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {name}")
+            try:
+                yield
+            except Exception:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+                raise
+            cursor.execute(f"RELEASE SAVEPOINT {name}")
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def _use_connection(self, connection=None):
+        """
+        Yield the caller's connection, or a pooled one if none was given.
+
+        Args:
+            connection: Connection of an enclosing batch_transaction (optional)
+
+        Yields:
+            MySQL connection object
+        """
+        if connection is not None:
+            yield connection
+        else:
+            with self.get_connection() as conn:
+                yield conn
+
+    def _get_max_packet(self, cursor) -> int:
+        """
+        Read the server's max_allowed_packet, once per instance.
+
+        Args:
+            cursor: Open database cursor
+
+        Returns:
+            Maximum packet size in bytes
+        """
+        if self._max_packet is None:
+            cursor.execute("SELECT @@max_allowed_packet")
+            self._max_packet = int(cursor.fetchone()[0])
+        return self._max_packet
+
+    def _packet_chunks(self, cursor, rows: List[Tuple]) -> Iterator[List[Tuple]]:
+        """
+        Split INSERT rows into chunks that fit in one packet.
+
+        A chunk holds at most _BULK_CHUNK_SIZE rows and an estimated
+        _PACKET_BUDGET of max_allowed_packet, so long article bodies shrink
+        the chunk instead of overflowing the packet.
+
+        Args:
+            cursor: Open database cursor
+            rows: Parameter tuples for a multi-row INSERT
+
+        Yields:
+            Lists of rows, one per INSERT statement
+        """
+        budget = int(self._get_max_packet(cursor) * _PACKET_BUDGET)
+        chunk = []
+        chunk_bytes = 0
+        for row in rows:
+            row_bytes = _ROW_OVERHEAD_BYTES + sum(
+                len(value.encode()) if isinstance(value, str) else _VALUE_BYTES for value in row
+            )
+            if chunk and (len(chunk) >= _BULK_CHUNK_SIZE or chunk_bytes + row_bytes > budget):
+                yield chunk
+                chunk = []
+                chunk_bytes = 0
+            chunk.append(row)
+            chunk_bytes += row_bytes
+        if chunk:
+            yield chunk
+
+    def warmup_url_bloom(self, days_back: int = 30) -> int:
+        """
+        Populate the URL Bloom filter with recently published article URLs.
+
+        Until this has run, URL existence checks always query the database.
+
+        Args:
+            days_back: Number of days of articles to load
+
+        Returns:
+            Number of URLs loaded
+        """
+        query = "SELECT url FROM articles WHERE published_at >= DATE_SUB(NOW(), INTERVAL %s DAY)"
+        loaded = 0
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, (days_back,))
+                while True:
+                    rows = cursor.fetchmany(5000)
+                    if not rows:
+                        break
+                    for (url,) in rows:
+                        self.url_bloom.add(url)
+                    loaded += len(rows)
+            finally:
+                cursor.close()
+
+        self._url_bloom_warm = True
+        logger.info(f"Loaded {loaded} article URLs into Bloom filter")
+        return loaded
+
+    def _may_exist(self, url: str) -> bool:
+        """
+        Check the URL Bloom filter before querying the database.
+
+        Args:
+            url: Article URL
+
+        Returns:
+            False only if the URL is definitely not stored
+        """
+        return not self._url_bloom_warm or url in self.url_bloom
+
     def insert_company(self, name: str, sector: str, symbol: Optional[str] = None) -> int:
         """
         Insert a new company or return existing ID.
@@ -83,23 +292,24 @@ class DatabaseManager:
         Returns:
             Company ID
         """
-        # First check if company exists
-        existing_id = self.get_company_id(name)
-        if existing_id:
-            return existing_id
+        if name in self._company_id_cache:
+            return self._company_id_cache[name]
 
+        # Upsert returns the existing ID on duplicate name in a single round-trip
         insert_query = """
-        INSERT INTO companies (name, sector, symbol, created_at)
-        VALUES (%s, %s, %s, %s)
+        INSERT INTO companies (name, sector, symbol)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
         """
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
             try:
-                cursor.execute(insert_query, (name, sector, symbol, datetime.now()))
+                cursor.execute(insert_query, (name, sector, symbol))
                 conn.commit()
                 company_id = cursor.lastrowid
-                logger.info(f"Inserted company: {name} with ID: {company_id}")
+                self._company_id_cache[name] = company_id
+                logger.info(f"Upserted company: {name} with ID: {company_id}")
                 return company_id
             except Error as e:
                 conn.rollback()
@@ -110,7 +320,7 @@ class DatabaseManager:
 
     def get_company_id(self, name: str) -> Optional[int]:
         """
-        Get company ID by name.
+        Get company ID by name, using the in-process cache when possible.
 
         Args:
             name: Company name
@@ -118,6 +328,9 @@ class DatabaseManager:
         Returns:
             Company ID or None if not found
         """
+        if name in self._company_id_cache:
+            return self._company_id_cache[name]
+
         query = "SELECT id FROM companies WHERE name = %s"
 
         with self.get_connection() as conn:
@@ -125,16 +338,79 @@ class DatabaseManager:
             try:
                 cursor.execute(query, (name,))
                 result = cursor.fetchone()
-                return result[0] if result else None
+                if not result:
+                    return None
+                self._company_id_cache[name] = result[0]
+                return result[0]
             finally:
                 cursor.close()
 
+    def refresh_companies(self) -> int:
+        """
+        Reload the company name to ID cache from the database.
+
+        Returns:
+            Number of companies cached
+        """
+        query = "SELECT id, name FROM companies"
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query)
+                self._company_id_cache = {name: company_id for company_id, name in cursor.fetchall()}
+                return len(self._company_id_cache)
+            finally:
+                cursor.close()
+
+    def prime_company_cache(self, names: List[str]) -> int:
+        """
+        Load IDs for the given company names into the cache with one SELECT.
+
+        Names already cached or not yet in the database are left alone.
+
+        Args:
+            names: Company names
+
+        Returns:
+            Number of company IDs added to the cache
+        """
+        missing = [name for name in dict.fromkeys(names) if name not in self._company_id_cache]
+        if not missing:
+            return 0
+
+        placeholders = ','.join(['%s'] * len(missing))
+        query = f"SELECT name, id FROM companies WHERE name IN ({placeholders})"
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, tuple(missing))
+                found = dict(cursor.fetchall())
+                self._company_id_cache.update(found)
+                return len(found)
+            finally:
+                cursor.close()
+
+    def get_company_ids(self, names: List[str]) -> Dict[str, int]:
+        """
+        Get IDs for several companies with at most one SELECT.
+
+        Args:
+            names: Company names
+
+        Returns:
+            Mapping of company name to ID for the names that exist
+        """
+        self.prime_company_cache(names)
+        return {name: self._company_id_cache[name] for name in names if name in self._company_id_cache}
+
     def insert_article(self, title: str, content: str, url: str, source: str,
                       published_at: datetime, company_id: int,
                       description: Optional[str] = None,
                       author: Optional[str] = None) -> int:
         """
-        Insert a new article.
+        Insert a new article or return the existing ID for its URL.
 
         Args:
             title: Article title
@@ -149,15 +425,12 @@ class DatabaseManager:
         Returns:
             Article ID
         """
-        # Check if article already exists (by URL)
-        if self.article_exists(url):
-            logger.info(f"Article already exists: {url}")
-            return self.get_article_id_by_url(url)
-
+        # Upsert returns the existing ID on duplicate URL in a single round-trip
         insert_query = """
         INSERT INTO articles (title, description, content, url, source,
-                             published_at, company_id, author, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                             published_at, company_id, author)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
         """
 
         with self.get_connection() as conn:
@@ -165,11 +438,13 @@ class DatabaseManager:
             try:
                 cursor.execute(insert_query, (
                     title, description, content, url, source,
-                    published_at, company_id, author, datetime.now()
+                    published_at, company_id, author
                 ))
                 conn.commit()
+                self.invalidate_report_cache()
+                self.url_bloom.add(url)
                 article_id = cursor.lastrowid
-                logger.info(f"Inserted article: {title[:50]}... with ID: {article_id}")
+                logger.info(f"Upserted article: {title[:50]}... with ID: {article_id}")
                 return article_id
             except Error as e:
                 conn.rollback()
@@ -178,26 +453,133 @@ class DatabaseManager:
             finally:
                 cursor.close()
 
-    def article_exists(self, url: str) -> bool:
+    def insert_articles_bulk(self, articles: List[Dict], connection=None) -> Dict[str, int]:
         """
-        Check if article exists by URL.
+        Insert multiple articles over a single connection and transaction.
+
+        Existing URLs are looked up with IN queries and skipped; new rows
+        are written with one multi-row INSERT per chunk (see _packet_chunks).
 
         Args:
-            url: Article URL
+            articles: Article dictionaries with title, content, url, source,
+                      published_at, company_id and optional description/author
+            connection: Connection of an enclosing batch_transaction, which
+                        then owns the commit (optional)
 
         Returns:
-            True if article exists
+            Mapping of article URL to article ID for all given articles
+        """
+        if not articles:
+            return {}
+
+        # A URL stored after warmup can still be a Bloom miss; tolerate it
+        insert_query = """
+        INSERT INTO articles (title, description, content, url, source,
+                             published_at, company_id, author)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE id = id
+        """
+
+        urls = list(dict.fromkeys(article['url'] for article in articles))
+
+        with self._use_connection(connection) as conn:
+            cursor = conn.cursor()
+            try:
+                # Only URLs that may already be stored need the lookup
+                candidate_urls = [url for url in urls if self._may_exist(url)]
+                article_ids = self._get_article_ids_by_urls(cursor, candidate_urls) if candidate_urls else {}
+
+                new_urls = {}
+                new_rows = []
+                for article in articles:
+                    url = article['url']
+                    if url in article_ids or url in new_urls:
+                        continue
+                    new_urls[url] = None
+                    new_rows.append((
+                        article['title'], article.get('description'), article.get('content', ''),
+                        url, article['source'], article['published_at'],
+                        article['company_id'], article.get('author')
+                    ))
+
+                if new_rows:
+                    for chunk in self._packet_chunks(cursor, new_rows):
+                        cursor.executemany(insert_query, chunk)
+                    article_ids.update(self._get_article_ids_by_urls(cursor, list(new_urls)))
+                if connection is None:
+                    conn.commit()
+                    self.invalidate_report_cache()
+
+                for url in new_urls:
+                    self.url_bloom.add(url)
+
+                logger.info(f"Bulk inserted {len(new_rows)} articles, "
+                            f"{len(urls) - len(new_rows)} already existed")
+                return article_ids
+            except Error as e:
+                if connection is None:
+                    conn.rollback()
+                logger.error(f"Error bulk inserting articles: {str(e)}")
+                raise
+            finally:
+                cursor.close()
+
+    def _get_article_ids_by_urls(self, cursor, urls: List[str]) -> Dict[str, int]:
+        """
+        Look up article IDs for a list of URLs, one query per _BULK_CHUNK_SIZE URLs.
+
+        Args:
+            cursor: Open database cursor
+            urls: Article URLs
+
+        Returns:
+            Mapping of URL to article ID for URLs that exist
+        """
+        article_ids = {}
+        for start in range(0, len(urls), _BULK_CHUNK_SIZE):
+            chunk = urls[start:start + _BULK_CHUNK_SIZE]
+            placeholders = ','.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT url, id FROM articles WHERE url IN ({placeholders})", tuple(chunk))
+            article_ids.update(cursor.fetchall())
+        return article_ids
+
+    def filter_new_urls(self, urls: List[str]) -> set:
         """
-        query = "SELECT 1 FROM articles WHERE url = %s"
+        Return the URLs that are not stored yet.
+
+        URLs the Bloom filter rules out skip the lookup; the rest are
+        checked with one IN query per _BULK_CHUNK_SIZE URLs.
+
+        Args:
+            urls: Article URLs
+
+        Returns:
+            Set of URLs with no stored article
+        """
+        new_urls = set(urls)
+        candidate_urls = [url for url in new_urls if self._may_exist(url)]
+        if not candidate_urls:
+            return new_urls
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
             try:
-                cursor.execute(query, (url,))
-                return cursor.fetchone() is not None
+                return new_urls - self._get_article_ids_by_urls(cursor, candidate_urls).keys()
             finally:
                 cursor.close()
 
+    def article_exists(self, url: str) -> bool:
+        """
+        Check if article exists by URL.
+
+        Args:
+            url: Article URL
+
+        Returns:
+            True if article exists
+        """
+        return url not in self.filter_new_urls([url])
+
     def get_article_id_by_url(self, url: str) -> Optional[int]:
         """
         Get article ID by URL.
@@ -237,8 +619,8 @@ class DatabaseManager:
         """
         insert_query = """
         INSERT INTO sentiment_scores (article_id, sentiment_score, confidence,
-                                    sentiment_label, processing_method, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s)
+                                    sentiment_label, processing_method)
+        VALUES (%s, %s, %s, %s, %s)
         """
 
         with self.get_connection() as conn:
@@ -246,9 +628,10 @@ class DatabaseManager:
             try:
                 cursor.execute(insert_query, (
                     article_id, sentiment_score, confidence,
-                    sentiment_label, processing_method, datetime.now()
+                    sentiment_label, processing_method
                 ))
                 conn.commit()
+                self.invalidate_report_cache()
                 sentiment_id = cursor.lastrowid
                 logger.info(f"Inserted sentiment score for article {article_id}: {sentiment_score}")
                 return sentiment_id
@@ -259,115 +642,320 @@ class DatabaseManager:
             finally:
                 cursor.close()
 
-    def get_weekly_sentiment_report(self, company_name: str) -> List[Dict]:
+    def insert_sentiment_scores_bulk(self, scores: List[Dict], connection=None) -> int:
+        """
+        Insert multiple sentiment analysis results in one transaction.
+
+        Rows are written with one multi-row INSERT per chunk (see _packet_chunks).
+
+        Re-analysed articles update their existing score for the same
+        processing method instead of failing the whole batch.
+
+        Args:
+            scores: Dictionaries with article_id, sentiment_score, confidence,
+                    sentiment_label and optional processing_method
+            connection: Connection of an enclosing batch_transaction, which
+                        then owns the commit (optional)
+
+        Returns:
+            Number of sentiment scores written
+        """
+        if not scores:
+            return 0
+
+        insert_query = """
+        INSERT INTO sentiment_scores (article_id, sentiment_score, confidence,
+                                    sentiment_label, processing_method)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            sentiment_score = VALUES(sentiment_score),
+            confidence = VALUES(confidence),
+            sentiment_label = VALUES(sentiment_label)
+        """
+
+        rows = [
+            (
+                score['article_id'], score['sentiment_score'], score['confidence'],
+                score['sentiment_label'], score.get('processing_method', 'textblob')
+            )
+            for score in scores
+        ]
+
+        with self._use_connection(connection) as conn:
+            cursor = conn.cursor()
+            try:
+                for chunk in self._packet_chunks(cursor, rows):
+                    cursor.executemany(insert_query, chunk)
+                if connection is None:
+                    conn.commit()
+                    self.invalidate_report_cache()
+                logger.info(f"Bulk inserted {len(rows)} sentiment scores")
+                return len(rows)
+            except Error as e:
+                if connection is None:
+                    conn.rollback()
+                logger.error(f"Error bulk inserting sentiment scores: {str(e)}")
+                raise
+            finally:
+                cursor.close()
+
+    def invalidate_report_cache(self) -> None:
+        """Drop all cached report results."""
+        self._report_cache.clear()
+
+    def _cached_report(self, key: Tuple) -> Optional[List[Dict]]:
         """
-        Generate weekly sentiment report for a company using complex SQL with JOINs.
+        Look up a cached report result.
+
+        Args:
+            key: Report name and arguments
+
+        Returns:
+            Copies of the cached rows, or None on a miss
+        """
+        rows = self._report_cache.get(key + (date.today(),))
+        if rows is None:
+            return None
+        self._report_cache.move_to_end(key + (date.today(),))
+        return [dict(row) for row in rows]
+
+    def _store_report(self, key: Tuple, rows: List[Dict]) -> None:
+        """
+        Cache a report result for the rest of the day.
+
+        Args:
+            key: Report name and arguments
+            rows: Report rows
+        """
+        self._report_cache[key + (date.today(),)] = [dict(row) for row in rows]
+        if len(self._report_cache) > _REPORT_CACHE_SIZE:
+            self._report_cache.popitem(last=False)
+
+    def refresh_daily_rollup(self, days: int = 2) -> int:
+        """
+        Rebuild recent rows of the daily sentiment rollup table.
+
+        Rollup rows for the refreshed days are deleted and re-aggregated
+        from articles and sentiment scores in one transaction, so days and
+        companies whose articles were removed do not keep stale counts.
+
+        Args:
+            days: Number of most recent days to refresh
+
+        Returns:
+            Number of rollup rows affected
+        """
+        delete_query = "DELETE FROM daily_sentiment_rollup WHERE day >= CURDATE() - INTERVAL %s DAY"
+        query = """
+        INSERT INTO daily_sentiment_rollup (
+            company_id, day, article_count, avg_sentiment, min_sentiment,
+            max_sentiment, avg_confidence, positive_count, negative_count, neutral_count
+        )
+        SELECT
+            a.company_id,
+            DATE(a.published_at) as day,
+            COUNT(a.id),
+            AVG(s.sentiment_score),
+            MIN(s.sentiment_score),
+            MAX(s.sentiment_score),
+            AVG(s.confidence),
+            SUM(CASE WHEN s.sentiment_label = 'positive' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN s.sentiment_label = 'negative' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN s.sentiment_label = 'neutral' THEN 1 ELSE 0 END)
+        FROM articles a
+        JOIN sentiment_scores s ON a.id = s.article_id
+        WHERE a.published_at >= CURDATE() - INTERVAL %s DAY
+        GROUP BY a.company_id, DATE(a.published_at)
+        """
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(delete_query, (days,))
+                cursor.execute(query, (days,))
+                conn.commit()
+                self.invalidate_report_cache()
+                affected = cursor.rowcount
+                logger.info(f"Refreshed daily sentiment rollup for last {days} days: {affected} rows")
+                return affected
+            except Error as e:
+                conn.rollback()
+                logger.error(f"Error refreshing daily sentiment rollup: {str(e)}")
+                raise
+            finally:
+                cursor.close()
+
+    def prune_daily_rollup(self, days_to_keep: int = 90) -> int:
+        """
+        Remove rollup rows for days whose articles have all been cleaned up.
+
+        Args:
+            days_to_keep: Retention window used by cleanup_old_articles
+
+        Returns:
+            Number of rollup rows deleted
+        """
+        query = """
+        DELETE FROM daily_sentiment_rollup
+        WHERE day < DATE(DATE_SUB(NOW(), INTERVAL %s DAY))
+        """
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, (days_to_keep,))
+                conn.commit()
+                self.invalidate_report_cache()
+                deleted = cursor.rowcount
+                logger.info(f"Pruned {deleted} daily sentiment rollup rows")
+                return deleted
+            except Error as e:
+                conn.rollback()
+                logger.error(f"Error pruning daily sentiment rollup: {str(e)}")
+                raise
+            finally:
+                cursor.close()
+
+    def get_weekly_sentiment_report(self, company_name: str,
+                                    stream: bool = False) -> Union[List[Dict], Iterator[Dict]]:
+        """
+        Generate weekly sentiment report for a company from the daily rollup.
+
+        Reads at most eight pre-aggregated rows by (company_id, day), the
+        last seven whole days plus today, instead of re-aggregating every
+        article; see refresh_daily_rollup. List
+        results are cached until the rollup is next refreshed.
 
         Args:
             company_name: Company name to analyze
+            stream: Yield rows as they are read instead of returning a list
 
         Returns:
-            List of sentiment report data
+            Sentiment report data
         """
         query = """
         SELECT
             c.name as company_name,
             c.sector,
-            DATE(a.published_at) as date,
-            COUNT(a.id) as article_count,
-            AVG(s.sentiment_score) as avg_sentiment,
-            MIN(s.sentiment_score) as min_sentiment,
-            MAX(s.sentiment_score) as max_sentiment,
-            AVG(s.confidence) as avg_confidence,
-            SUM(CASE WHEN s.sentiment_label = 'positive' THEN 1 ELSE 0 END) as positive_count,
-            SUM(CASE WHEN s.sentiment_label = 'negative' THEN 1 ELSE 0 END) as negative_count,
-            SUM(CASE WHEN s.sentiment_label = 'neutral' THEN 1 ELSE 0 END) as neutral_count
-        FROM companies c
-        JOIN articles a ON c.id = a.company_id
-        JOIN sentiment_scores s ON a.id = s.article_id
+            r.day as date,
+            r.article_count,
+            r.avg_sentiment,
+            r.min_sentiment,
+            r.max_sentiment,
+            r.avg_confidence,
+            r.positive_count,
+            r.negative_count,
+            r.neutral_count
+        FROM daily_sentiment_rollup r
+        JOIN companies c ON c.id = r.company_id
         WHERE c.name = %s
-          AND a.published_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-        GROUP BY c.name, c.sector, DATE(a.published_at)
-        ORDER BY DATE(a.published_at) DESC
+          AND r.day >= CURDATE() - INTERVAL 7 DAY
+        ORDER BY r.day DESC
         """
 
+        if stream:
+            return self._iter_query(query, (company_name,))
+
+        cache_key = ('weekly', company_name)
+        cached = self._cached_report(cache_key)
+        if cached is not None:
+            return cached
+
         with self.get_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             try:
                 cursor.execute(query, (company_name,))
                 results = cursor.fetchall()
+                self._store_report(cache_key, results)
                 logger.info(f"Generated weekly report for {company_name}: {len(results)} days")
                 return results
             finally:
                 cursor.close()
 
-    def get_sector_sentiment_analysis(self, sector: str, days_back: int = 30) -> List[Dict]:
+    def get_sector_sentiment_analysis(self, sector: str, days_back: int = 30,
+                                      stream: bool = False) -> Union[List[Dict], Iterator[Dict]]:
         """
-        Analyze sentiment for an entire sector using subqueries.
+        Analyze sentiment for an entire sector using a CTE and window functions.
+
+        The per-company aggregate is computed once and both the sector
+        rollup and the top company are derived from it. List results are
+        cached until the rollup is next refreshed.
 
         Args:
             sector: Business sector to analyze
             days_back: Number of days to look back
+            stream: Yield rows as they are read instead of returning a list
 
         Returns:
             Sector sentiment analysis results
         """
         query = """
-        SELECT
-            sector_data.sector,
-            sector_data.total_articles,
-            sector_data.avg_sentiment,
-            sector_data.sentiment_trend,
-            company_rankings.top_company,
-            company_rankings.top_company_sentiment
-        FROM (
-            SELECT
-                c.sector,
-                COUNT(a.id) as total_articles,
-                AVG(s.sentiment_score) as avg_sentiment,
-                CASE
-                    WHEN AVG(s.sentiment_score) > 0.1 THEN 'Positive'
-                    WHEN AVG(s.sentiment_score) < -0.1 THEN 'Negative'
-                    ELSE 'Neutral'
-                END as sentiment_trend
-            FROM companies c
-            JOIN articles a ON c.id = a.company_id
-            JOIN sentiment_scores s ON a.id = s.article_id
-            WHERE c.sector = %s
-              AND a.published_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
-            GROUP BY c.sector
-        ) as sector_data
-        LEFT JOIN (
+        WITH company_agg AS (
             SELECT
                 c.sector,
-                c.name as top_company,
-                AVG(s.sentiment_score) as top_company_sentiment,
-                ROW_NUMBER() OVER (PARTITION BY c.sector ORDER BY AVG(s.sentiment_score) DESC) as rn
+                c.name,
+                COUNT(a.id) as article_count,
+                AVG(s.sentiment_score) as avg_sentiment
             FROM companies c
             JOIN articles a ON c.id = a.company_id
             JOIN sentiment_scores s ON a.id = s.article_id
             WHERE c.sector = %s
               AND a.published_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
             GROUP BY c.sector, c.name
-        ) as company_rankings ON sector_data.sector = company_rankings.sector AND company_rankings.rn = 1
+        ),
+        ranked AS (
+            SELECT
+                sector,
+                name,
+                avg_sentiment,
+                SUM(article_count) OVER (PARTITION BY sector) as total_articles,
+                SUM(article_count * avg_sentiment) OVER (PARTITION BY sector) /
+                    SUM(article_count) OVER (PARTITION BY sector) as sector_avg_sentiment,
+                ROW_NUMBER() OVER (PARTITION BY sector ORDER BY avg_sentiment DESC) as rn
+            FROM company_agg
+        )
+        SELECT
+            sector,
+            total_articles,
+            sector_avg_sentiment as avg_sentiment,
+            CASE
+                WHEN sector_avg_sentiment > 0.1 THEN 'Positive'
+                WHEN sector_avg_sentiment < -0.1 THEN 'Negative'
+                ELSE 'Neutral'
+            END as sentiment_trend,
+            name as top_company,
+            avg_sentiment as top_company_sentiment
+        FROM ranked
+        WHERE rn = 1
         """
 
+        if stream:
+            return self._iter_query(query, (sector, days_back))
+
+        cache_key = ('sector', sector, days_back)
+        cached = self._cached_report(cache_key)
+        if cached is not None:
+            return cached
+
         with self.get_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             try:
-                cursor.execute(query, (sector, days_back, sector, days_back))
+                cursor.execute(query, (sector, days_back))
                 results = cursor.fetchall()
+                self._store_report(cache_key, results)
                 logger.info(f"Generated sector analysis for {sector}: {len(results)} records")
                 return results
             finally:
                 cursor.close()
 
-    def get_trending_companies(self, limit: int = 10) -> List[Dict]:
+    def get_trending_companies(self, limit: int = 10,
+                               stream: bool = False) -> Union[List[Dict], Iterator[Dict]]:
         """
         Get companies with most articles in the last 24 hours.
 
         Args:
             limit: Number of companies to return
+            stream: Yield rows as they are read instead of returning a list
 
         Returns:
             List of trending companies with article counts
@@ -387,6 +975,9 @@ class DatabaseManager:
         LIMIT %s
         """
 
+        if stream:
+            return self._iter_query(query, (limit,))
+
         with self.get_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             try:
@@ -397,6 +988,34 @@ class DatabaseManager:
             finally:
                 cursor.close()
 
+    def _iter_query(self, query: str, params: Tuple = ()) -> Iterator[Dict]:
+        """
+        Stream query results as dictionaries with constant memory.
+
+        The connection stays checked out until the iterator is exhausted
+        or closed.
+
+        Args:
+            query: SQL query string
+            params: Query parameters
+
+        Yields:
+            Result rows
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor(dictionary=True, buffered=False)
+            try:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(_STREAM_FETCH_SIZE)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                # Drain rows left by an early stop before the connection is reused
+                conn.consume_results()
+                cursor.close()
+
     def execute_custom_query(self, query: str, params: Tuple = ()) -> List[Dict]:
         """
         Execute a custom SQL query.
@@ -416,6 +1035,7 @@ class DatabaseManager:
                     return cursor.fetchall()
                 else:
                     conn.commit()
+                    self.invalidate_report_cache()
                     return [{'affected_rows': cursor.rowcount}]
             except Error as e:
                 conn.rollback()
@@ -424,28 +1044,42 @@ class DatabaseManager:
             finally:
                 cursor.close()
 
-    def cleanup_old_articles(self, days_to_keep: int = 90) -> int:
+    def cleanup_old_articles(self, days_to_keep: int = 90, batch_size: int = 5000) -> int:
         """
         Remove articles older than specified days.
 
+        Rows are deleted in batches, committing after each one, so locks are
+        held briefly and concurrent ingestion is not blocked. Sentiment
+        scores are removed through the ON DELETE CASCADE foreign key.
+
         Args:
             days_to_keep: Number of days to keep
+            batch_size: Maximum number of articles deleted per transaction
 
         Returns:
             Number of articles deleted
         """
         query = """
-        DELETE a, s FROM articles a
-        LEFT JOIN sentiment_scores s ON a.id = s.article_id
-        WHERE a.published_at < DATE_SUB(NOW(), INTERVAL %s DAY)
+        DELETE FROM articles
+        WHERE published_at < DATE_SUB(NOW(), INTERVAL %s DAY)
+        ORDER BY published_at
+        LIMIT %s
         """
 
+        deleted_count = 0
+
         with self.get_connection() as conn:
-            cursor = conn.cursor()
+            # Server-side prepared statement: parsed once, re-executed per batch
+            cursor = conn.cursor(prepared=True)
             try:
-                cursor.execute(query, (days_to_keep,))
-                conn.commit()
-                deleted_count = cursor.rowcount
+                while True:
+                    cursor.execute(query, (days_to_keep, batch_size))
+                    batch_deleted = cursor.rowcount
+                    conn.commit()
+                    deleted_count += batch_deleted
+                    if batch_deleted < batch_size:
+                        break
+                self.invalidate_report_cache()
                 logger.info(f"Cleaned up {deleted_count} old articles")
                 return deleted_count
             except Error as e:
@@ -453,4 +1087,4 @@ class DatabaseManager:
                 logger.error(f"Error cleaning up articles: {str(e)}")
                 raise
             finally:
-                cursor.close()
\ No newline at end of file
+                cursor.close()
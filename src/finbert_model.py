@@ -0,0 +1,115 @@
+"""
+FinBertModel class for finance-domain sentiment scoring.
+Runs an ONNX export of ProsusAI/finbert with onnxruntime on CPU.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, List
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+except ImportError:  # Optional backend; callers check FINBERT_AVAILABLE
+    np = ort = Tokenizer = None
+
+logger = logging.getLogger(__name__)
+
+FINBERT_AVAILABLE = ort is not None
+
+# Texts sent to onnxruntime per inference call
+_INFERENCE_BATCH_SIZE = 32
+
+# BERT input limit in tokens
+_MAX_TOKENS = 512
+
+
+class FinBertModel:
+    """Scores text with a (optionally int8-quantized) FinBERT ONNX model."""
+
+    def __init__(self, model_dir: str):
+        """
+        Load the ONNX model, tokenizer and label mapping.
+
+        The directory is the output of `optimum-cli export onnx
+        --model ProsusAI/finbert --task text-classification`, optionally
+        quantized to model_quantized.onnx.
+
+        Args:
+            model_dir: Directory containing the exported model
+        """
+        if not FINBERT_AVAILABLE:
+            raise ImportError("FinBERT requires numpy, onnxruntime and tokenizers")
+
+        model_path = os.path.join(model_dir, 'model_quantized.onnx')
+        if not os.path.exists(model_path):
+            model_path = os.path.join(model_dir, 'model.onnx')
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=['CPUExecutionProvider']
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=_MAX_TOKENS)
+        self.tokenizer.enable_padding()
+
+        with open(os.path.join(model_dir, 'config.json')) as f:
+            id2label = json.load(f)['id2label']
+        self.labels = [id2label[str(i)].lower() for i in range(len(id2label))]
+
+        logger.info(f"Loaded FinBERT model from {model_path}")
+
+    def predict(self, texts: List[str]) -> List[Dict]:
+        """
+        Score texts in inference batches of _INFERENCE_BATCH_SIZE.
+
+        Args:
+            texts: Preprocessed, non-empty texts
+
+        Returns:
+            Sentiment results in the combined-result format
+        """
+        results = []
+        for start in range(0, len(texts), _INFERENCE_BATCH_SIZE):
+            results.extend(self._predict_batch(texts[start:start + _INFERENCE_BATCH_SIZE]))
+        return results
+
+    def _predict_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        Run one onnxruntime call over a batch of texts.
+
+        Args:
+            texts: Preprocessed, non-empty texts
+
+        Returns:
+            Sentiment results in the combined-result format
+        """
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+            'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            'token_type_ids': np.array([e.type_ids for e in encodings], dtype=np.int64)
+        }
+        logits = self.session.run(None, {k: v for k, v in inputs.items() if k in self.input_names})[0]
+
+        # Softmax over the label axis
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probabilities = exp / exp.sum(axis=1, keepdims=True)
+
+        results = []
+        for row in probabilities:
+            probs = dict(zip(self.labels, row.tolist()))
+            label = max(probs, key=probs.get)
+            results.append({
+                'method': 'finbert',
+                'sentiment_score': probs.get('positive', 0.0) - probs.get('negative', 0.0),
+                'confidence': probs[label],
+                'sentiment_label': label,
+                'individual_results': {'finbert': probs}
+            })
+        return results
@@ -5,8 +5,13 @@ Event-driven processing orchestrating the entire data pipeline.
 
 import json
 import logging
+import orjson
 import os
-from typing import Dict, Any, List
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, List, Tuple, Iterable, Iterator
 from datetime import datetime
 
 # Import our custom classes
@@ -21,29 +26,72 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Articles written and scored per bulk database round-trip
+_BATCH_SIZE = 500
+
+# Characters of article content passed to sentiment analysis
+_MAX_CONTENT_CHARS = 2000
+
+# Pipeline reused across warm invocations of the same execution environment
+PIPELINE = None
+
+# Words in article text and company names/symbols
+_TOKEN_RE = re.compile(r'\w+')
+
+# Company name words too generic to identify a company on their own
+_GENERIC_NAME_TOKENS = frozenset({'inc', 'corp', 'corporation', 'co', 'com', 'company', 'group', 'holdings'})
+
+# Default tracked companies, shared read-only by every pipeline instance
+_TRACKED_COMPANIES = tuple(MappingProxyType(company) for company in (
+    {'name': 'Apple Inc.', 'sector': 'Technology', 'symbol': 'AAPL'},
+    {'name': 'Microsoft Corporation', 'sector': 'Technology', 'symbol': 'MSFT'},
+    {'name': 'Amazon.com Inc.', 'sector': 'Technology', 'symbol': 'AMZN'},
+    {'name': 'Tesla Inc.', 'sector': 'Automotive', 'symbol': 'TSLA'},
+    {'name': 'Alphabet Inc.', 'sector': 'Technology', 'symbol': 'GOOGL'},
+    {'name': 'Meta Platforms Inc.', 'sector': 'Technology', 'symbol': 'META'},
+    {'name': 'NVIDIA Corporation', 'sector': 'Technology', 'symbol': 'NVDA'},
+    {'name': 'JPMorgan Chase & Co.', 'sector': 'Financial Services', 'symbol': 'JPM'},
+    {'name': 'Johnson & Johnson', 'sector': 'Healthcare', 'symbol': 'JNJ'},
+    {'name': 'Berkshire Hathaway', 'sector': 'Financial Services', 'symbol': 'BRK.A'}
+))
+
 
 class SentimentFinancePipeline:
     """Main pipeline orchestrator for sentiment analysis."""
 
+    __slots__ = ('data_fetcher', 'db_manager', 'sentiment_analyzer', 'tracked_companies',
+                 '_keyword_map_key', '_keyword_to_id', '_url_bloom_warm')
+
     def __init__(self):
         """Initialize pipeline components."""
         self.data_fetcher = DataFetcher()
         self.db_manager = DatabaseManager()
         self.sentiment_analyzer = SentimentAnalyzer()
 
-        # Default companies to track (can be extended)
-        self.tracked_companies = [
-            {'name': 'Apple Inc.', 'sector': 'Technology', 'symbol': 'AAPL'},
-            {'name': 'Microsoft Corporation', 'sector': 'Technology', 'symbol': 'MSFT'},
-            {'name': 'Amazon.com Inc.', 'sector': 'Technology', 'symbol': 'AMZN'},
-            {'name': 'Tesla Inc.', 'sector': 'Automotive', 'symbol': 'TSLA'},
-            {'name': 'Alphabet Inc.', 'sector': 'Technology', 'symbol': 'GOOGL'},
-            {'name': 'Meta Platforms Inc.', 'sector': 'Technology', 'symbol': 'META'},
-            {'name': 'NVIDIA Corporation', 'sector': 'Technology', 'symbol': 'NVDA'},
-            {'name': 'JPMorgan Chase & Co.', 'sector': 'Financial Services', 'symbol': 'JPM'},
-            {'name': 'Johnson & Johnson', 'sector': 'Healthcare', 'symbol': 'JNJ'},
-            {'name': 'Berkshire Hathaway', 'sector': 'Financial Services', 'symbol': 'BRK.A'}
-        ]
+        # Default companies to track; assign a new sequence to extend, and
+        # sector searches and keyword matching follow on the next run
+        self.tracked_companies = _TRACKED_COMPANIES
+
+        # Keyword map for _determine_company_id, rebuilt when company_ids change
+        self._keyword_map_key = None
+        self._keyword_to_id = {}
+
+        # Set once the database URL Bloom filter has been loaded
+        self._url_bloom_warm = False
+
+    def warm_init(self):
+        """
+        Prime CPU-only state ahead of the first invocation.
+
+        Safe to run during SnapStart snapshotting or provisioned-concurrency
+        init: database and HTTP connections are opened lazily on first use,
+        so no sockets end up in the snapshot.
+        """
+        self.sentiment_analyzer.analyze_sentiment("Shares rose after strong quarterly earnings.")
+
+    def close(self):
+        """Release pooled resources held by pipeline components."""
+        self.data_fetcher.close()
 
     def process_pipeline(self, event_type: str = 'scheduled') -> Dict[str, Any]:
         """
@@ -70,27 +118,32 @@ class SentimentFinancePipeline:
         try:
             logger.info(f"Starting sentiment finance pipeline - Event: {event_type}")
 
-            # Step 1: Ensure companies exist in database
-            company_ids = self._setup_companies()
+            # Steps 1 and 2: ensure companies exist in database while fetching
+            # news articles; the fetch only needs company names, not IDs
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                setup = executor.submit(self._setup_companies)
+                executor.submit(self._warm_url_bloom)
+                articles = self._count_fetched(self._fetch_all_news_articles(), results)
+                company_ids = setup.result()
             results['companies_processed'] = len(company_ids)
 
-            # Step 2: Fetch news articles for all companies
-            articles = self._fetch_all_news_articles()
-            results['articles_fetched'] = len(articles)
-
-            if not articles:
-                logger.warning("No articles fetched, ending pipeline execution")
-                return results
-
-            # Step 3: Process articles and perform sentiment analysis
+            # Step 3: Process articles and perform sentiment analysis as they stream in
             processed_count = self._process_articles(articles, company_ids)
             results['articles_processed'] = processed_count
             results['sentiment_scores_created'] = processed_count
 
+            if not results['articles_fetched']:
+                logger.warning("No articles fetched, ending pipeline execution")
+                self._refresh_daily_rollup(results)
+                return results
+
             # Step 4: Cleanup old data (optional maintenance)
             if event_type == 'maintenance':
                 deleted_count = self.db_manager.cleanup_old_articles(days_to_keep=90)
                 results['old_articles_deleted'] = deleted_count
+                self.db_manager.prune_daily_rollup(days_to_keep=90)
+
+            self._refresh_daily_rollup(results)
 
             results['success'] = True
             end_time = datetime.now()
@@ -107,6 +160,37 @@ class SentimentFinancePipeline:
 
         return results
 
+    def _refresh_daily_rollup(self, results: Dict[str, Any]) -> None:
+        """
+        Rebuild the report rollup for the fetch window (7 days).
+
+        A failure is recorded in the results and does not fail the run.
+
+        Args:
+            results: Pipeline execution results to record errors in
+        """
+        try:
+            self.db_manager.refresh_daily_rollup(days=7)
+        except Exception as e:
+            logger.error(f"Error refreshing daily sentiment rollup: {str(e)}")
+            results['errors'].append(str(e))
+
+    def _warm_url_bloom(self) -> None:
+        """
+        Load stored article URLs into the database Bloom filter, once.
+
+        Runs on the first pipeline run rather than in warm_init, which must
+        not open sockets. A failed load is retried on the next run; until
+        then every URL is checked against the database.
+        """
+        if self._url_bloom_warm:
+            return
+        try:
+            self.db_manager.warmup_url_bloom()
+            self._url_bloom_warm = True
+        except Exception as e:
+            logger.error(f"Error warming URL Bloom filter: {str(e)}")
+
     def _setup_companies(self) -> Dict[str, int]:
         """
         Ensure all tracked companies exist in the database.
@@ -114,9 +198,16 @@ class SentimentFinancePipeline:
         Returns:
             Mapping of company names to their database IDs
         """
-        company_ids = {}
+        # Known companies resolve in one lookup; only missing ones are upserted
+        try:
+            company_ids = self.db_manager.get_company_ids([company['name'] for company in self.tracked_companies])
+        except Exception as e:
+            logger.error(f"Error looking up companies: {str(e)}")
+            company_ids = {}
 
         for company in self.tracked_companies:
+            if company['name'] in company_ids:
+                continue
             try:
                 company_id = self.db_manager.insert_company(
                     name=company['name'],
@@ -131,96 +222,209 @@ class SentimentFinancePipeline:
 
         return company_ids
 
-    def _fetch_all_news_articles(self) -> List[Dict]:
+    @staticmethod
+    def _count_fetched(articles: Iterable[Dict], results: Dict[str, Any]) -> Iterator[Dict]:
+        """
+        Pass articles through while counting them into results.
+
+        Args:
+            articles: Article stream
+            results: Pipeline results updated with 'articles_fetched'
+
+        Yields:
+            The same articles
+        """
+        for article in articles:
+            results['articles_fetched'] += 1
+            yield article
+
+    def _fetch_all_news_articles(self) -> Iterator[Dict]:
         """
         Fetch news articles for all tracked companies.
 
+        Company and sector requests run concurrently in a single round,
+        which completes before this returns so it can overlap other work.
+        The same story can arrive from several company and sector searches;
+        only its first, most specific copy is yielded.
+
         Returns:
-            List of all fetched articles
+            Lazy iterator over fetched articles, unique by URL
         """
-        all_articles = []
         company_names = [company['name'] for company in self.tracked_companies]
+        # Sectors searched for broader coverage, deduplicated in a stable order
+        sectors = list(dict.fromkeys(company['sector'].lower() for company in self.tracked_companies))
 
+        # Deduplicate within this run only; stored URLs are filtered later
+        self.data_fetcher.reset_seen_urls()
         try:
-            # Fetch articles for all companies
-            articles = self.data_fetcher.fetch_financial_news(
+            articles = self.data_fetcher.fetch_all_news(
                 companies=company_names,
+                sectors=sectors,  # Also fetch sector-based news
                 hours_back=168  # Last 7 days (168 hours)
             )
-            all_articles.extend(articles)
-
-            # Also fetch sector-based news for broader coverage (7 days)
-            sectors = list(set(company['sector'] for company in self.tracked_companies))
-            for sector in sectors:
-                try:
-                    sector_articles = self.data_fetcher.fetch_sector_news(
-                        sector=sector.lower(),
-                        hours_back=168  # Last 7 days
-                    )
-                    all_articles.extend(sector_articles)
-                except Exception as e:
-                    logger.error(f"Error fetching sector news for {sector}: {str(e)}")
-                    continue
-
         except Exception as e:
             logger.error(f"Error fetching news articles: {str(e)}")
             raise
 
-        return all_articles
+        return self._unique_by_url(articles)
+
+    @staticmethod
+    def _unique_by_url(articles: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Drop repeated copies of an article, keeping the first.
+
+        Args:
+            articles: Article stream
 
-    def _process_articles(self, articles: List[Dict], company_ids: Dict[str, int]) -> int:
+        Yields:
+            Articles whose URL has not been yielded before
+        """
+        seen_urls = set()
+        for article in articles:
+            url = article.get('url')
+            if url not in seen_urls:
+                seen_urls.add(url)
+                yield article
+
+    def _process_articles(self, articles: Iterable[Dict], company_ids: Dict[str, int]) -> int:
         """
         Process articles: store in database and perform sentiment analysis.
 
+        Articles are consumed lazily and written and scored in batches of
+        _BATCH_SIZE, so each batch costs one bulk article insert and one
+        bulk score insert and only one batch is held at a time.
+
         Args:
-            articles: List of articles to process
+            articles: Articles to process
             company_ids: Mapping of company names to IDs
 
         Returns:
             Number of articles successfully processed
         """
         processed_count = 0
+        batch = []
 
         for article in articles:
-            try:
-                # Determine which company this article relates to
-                company_id = self._determine_company_id(article, company_ids)
-                if not company_id:
-                    logger.debug(f"Could not determine company for article: {article.get('title', '')}")
-                    continue
+            # Determine which company this article relates to
+            company_id = self._determine_company_id(article, company_ids)
+            if not company_id:
+                logger.debug(f"Could not determine company for article: {article.get('title', '')}")
+                continue
 
-                # Insert article into database
-                article_id = self.db_manager.insert_article(
-                    title=article['title'],
-                    content=article.get('content', ''),
-                    url=article['url'],
-                    source=article['source'],
-                    published_at=article['published_at'],
-                    company_id=company_id,
-                    description=article.get('description'),
-                    author=article.get('author')
-                )
+            batch.append((article, company_id))
+            if len(batch) >= _BATCH_SIZE:
+                processed_count += self._process_article_batch(batch)
+                batch = []
 
-                # Perform sentiment analysis
-                text_for_analysis = self._prepare_text_for_analysis(article)
-                sentiment_result = self.sentiment_analyzer.analyze_sentiment(text_for_analysis)
-
-                # Insert sentiment scores
-                self.db_manager.insert_sentiment_score(
-                    article_id=article_id,
-                    sentiment_score=sentiment_result['sentiment_score'],
-                    confidence=sentiment_result['confidence'],
-                    sentiment_label=sentiment_result['sentiment_label'],
-                    processing_method=sentiment_result['method']
-                )
+        if batch:
+            processed_count += self._process_article_batch(batch)
+
+        return processed_count
 
-                processed_count += 1
+    def _process_article_batch(self, batch: List[Tuple[Dict, int]]) -> int:
+        """
+        Store one batch of articles and their sentiment scores.
 
+        Both bulk inserts share a single transaction, so a batch costs one
+        commit. If the bulk insert fails, the batch is rolled back and
+        retried one article per savepoint, so a bad row only loses itself.
+        Articles whose analysis produced no score are not stored, so a later
+        run still sees them as new and retries them.
+
+        Args:
+            batch: Articles paired with their resolved company IDs
+
+        Returns:
+            Number of articles successfully processed
+        """
+        try:
+            # Articles stored by an earlier run are already scored
+            new_urls = self.db_manager.filter_new_urls([article['url'] for article, _ in batch])
+            batch = [(article, company_id) for article, company_id in batch if article['url'] in new_urls]
+            if not batch:
+                return 0
+
+            # Perform sentiment analysis before the transaction opens
+            sentiment_results = self.sentiment_analyzer.analyze_batch(
+                [self._prepare_text_for_analysis(article) for article, _ in batch]
+            )
+
+            scored = []
+            for (article, company_id), sentiment_result in zip(batch, sentiment_results):
+                if 'sentiment_score' not in sentiment_result:
+                    logger.error(f"Error processing article {article.get('url', 'unknown')}: "
+                                 f"{sentiment_result.get('error', 'no sentiment score')}")
+                    continue
+                scored.append((article, company_id, sentiment_result))
+            if not scored:
+                return 0
+
+            # Articles and their scores are committed together
+            try:
+                with self.db_manager.batch_transaction() as conn:
+                    return self._store_scored_articles(scored, conn)
             except Exception as e:
-                logger.error(f"Error processing article {article.get('url', 'unknown')}: {str(e)}")
+                logger.warning(f"Bulk insert of {len(scored)} articles failed, "
+                               f"retrying one at a time: {str(e)}")
+
+            # Still one commit, but a failing row only rolls back its savepoint
+            stored = 0
+            with self.db_manager.batch_transaction() as conn:
+                for item in scored:
+                    try:
+                        with self.db_manager.savepoint(conn):
+                            stored += self._store_scored_articles([item], conn)
+                    except Exception as e:
+                        logger.error(f"Error processing article {item[0].get('url', 'unknown')}: {str(e)}")
+            return stored
+
+        except Exception as e:
+            logger.error(f"Error processing batch of {len(batch)} articles: {str(e)}")
+            return 0
+
+    def _store_scored_articles(self, scored: List[Tuple[Dict, int, Dict]], conn) -> int:
+        """
+        Insert scored articles and their sentiment scores on one connection.
+
+        Args:
+            scored: Articles with their company IDs and sentiment results
+            conn: Connection of an enclosing batch_transaction
+
+        Returns:
+            Number of sentiment scores written
+        """
+        article_ids = self.db_manager.insert_articles_bulk([
+            {
+                'title': article['title'],
+                'content': article.get('content', ''),
+                'url': article['url'],
+                'source': article['source'],
+                'published_at': article['published_at'],
+                'company_id': company_id,
+                'description': article.get('description'),
+                'author': article.get('author')
+            }
+            for article, company_id, _ in scored
+        ], connection=conn)
+
+        scores = {}
+        for article, _, sentiment_result in scored:
+            article_id = article_ids.get(article['url'])
+            if article_id is None:
+                logger.error(f"Error processing article {article.get('url', 'unknown')}: no article ID")
                 continue
 
-        return processed_count
+            scores.setdefault(article_id, {
+                'article_id': article_id,
+                'sentiment_score': sentiment_result['sentiment_score'],
+                'confidence': sentiment_result['confidence'],
+                'sentiment_label': sentiment_result['sentiment_label'],
+                'processing_method': sentiment_result['method']
+            })
+
+        # Insert sentiment scores
+        self.db_manager.insert_sentiment_scores_bulk(list(scores.values()), connection=conn)
+        return len(scores)
 
     def _determine_company_id(self, article: Dict, company_ids: Dict[str, int]) -> int:
         """
@@ -238,26 +442,54 @@ class SentimentFinancePipeline:
         if search_term in company_ids:
             return company_ids[search_term]
 
-        # Check if company name appears in title or content
+        # Check if company name or stock symbol appears in title or content
         article_text = (
-            article.get('title', '') + ' ' +
-            article.get('description', '') + ' ' +
-            article.get('content', '')
+            (article.get('title') or '') + ' ' +
+            (article.get('description') or '') + ' ' +
+            (article.get('content') or '')
         ).lower()
 
-        for company_name, company_id in company_ids.items():
-            # Simple keyword matching - could be enhanced with NER
-            company_keywords = company_name.lower().split()
-            if any(keyword in article_text for keyword in company_keywords):
+        # First mentioned company wins; the scan stops at the first known word
+        keyword_to_id = self._keyword_map(company_ids)
+        for match in _TOKEN_RE.finditer(article_text):
+            company_id = keyword_to_id.get(match.group())
+            if company_id:
                 return company_id
 
-        # Check for stock symbols
-        for company in self.tracked_companies:
-            if company.get('symbol') and company['symbol'].lower() in article_text:
-                return company_ids.get(company['name'])
-
         return None
 
+    def _keyword_map(self, company_ids: Dict[str, int]) -> Dict[str, int]:
+        """
+        Build (or reuse) the lowercase keyword to company ID map.
+
+        Keywords are the name words and stock symbol tokens of each company.
+        Generic words and tokens shared by several companies are left out
+        because they cannot identify a single company.
+
+        Args:
+            company_ids: Mapping of company names to IDs
+
+        Returns:
+            Mapping of keyword to company ID
+        """
+        key = tuple(company_ids.items())
+        if self._keyword_map_key == key:
+            return self._keyword_to_id
+
+        symbols = {company['name']: company.get('symbol') or '' for company in self.tracked_companies}
+        owners = defaultdict(set)
+        for company_name, company_id in company_ids.items():
+            # Simple keyword matching - could be enhanced with NER
+            for token in _TOKEN_RE.findall(f"{company_name} {symbols.get(company_name, '')}".lower()):
+                if len(token) > 1 and token not in _GENERIC_NAME_TOKENS:
+                    owners[token].add(company_id)
+
+        self._keyword_map_key = key
+        self._keyword_to_id = {
+            token: next(iter(ids)) for token, ids in owners.items() if len(ids) == 1
+        }
+        return self._keyword_to_id
+
     def _prepare_text_for_analysis(self, article: Dict) -> str:
         """
         Prepare article text for sentiment analysis.
@@ -268,25 +500,17 @@ class SentimentFinancePipeline:
         Returns:
             Combined text for analysis
         """
-        # Combine title, description, and content with appropriate weighting
-        text_parts = []
-
-        if article.get('title'):
-            # Title is most important, so repeat it
-            text_parts.append(article['title'])
-            text_parts.append(article['title'])
+        # Title is most important, so repeat it
+        title = article.get('title') or ''
+        description = article.get('description') or ''
 
-        if article.get('description'):
-            text_parts.append(article['description'])
+        # Truncate content if too long to avoid token limits
+        content = article.get('content') or ''
+        suffix = '...' if len(content) > _MAX_CONTENT_CHARS else ''
 
-        if article.get('content'):
-            # Truncate content if too long to avoid token limits
-            content = article['content']
-            if len(content) > 2000:
-                content = content[:2000] + '...'
-            text_parts.append(content)
-
-        return ' '.join(text_parts)
+        # Skip empty parts so equivalent articles give identical text
+        return ' '.join(part for part in (title, title, description, content[:_MAX_CONTENT_CHARS])
+                        if part) + suffix
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -300,6 +524,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Pipeline execution results
     """
+    global PIPELINE
+
     try:
         # Determine event type
         event_source = event.get('source', '')
@@ -309,14 +535,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.info(f"Lambda function triggered by: {event_source}")
         logger.info(f"Event type: {event_type}")
 
-        # Initialize and run pipeline
-        pipeline = SentimentFinancePipeline()
-        results = pipeline.process_pipeline(event_type=event_type)
+        # Initialize once per cold start, then run pipeline
+        if PIPELINE is None:
+            PIPELINE = SentimentFinancePipeline()
+        results = PIPELINE.process_pipeline(event_type=event_type)
 
         # Return results
         return {
             'statusCode': 200,
-            'body': json.dumps(results, default=str),
+            'body': orjson.dumps(results, default=str).decode(),
             'headers': {
                 'Content-Type': 'application/json'
             }
@@ -326,10 +553,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.error(f"Lambda handler error: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': orjson.dumps({
                 'error': str(e),
                 'success': False
-            }),
+            }).decode(),
             'headers': {
                 'Content-Type': 'application/json'
             }
@@ -347,7 +574,21 @@ def local_test_handler(event_type: str = 'scheduled') -> Dict[str, Any]:
         Pipeline execution results
     """
     pipeline = SentimentFinancePipeline()
-    return pipeline.process_pipeline(event_type=event_type)
+    try:
+        return pipeline.process_pipeline(event_type=event_type)
+    finally:
+        pipeline.close()
+
+
+# SnapStart and provisioned concurrency run module init ahead of traffic,
+# so build and prime the pipeline there instead of on the first request
+if os.getenv('AWS_LAMBDA_INITIALIZATION_TYPE') in ('snap-start', 'provisioned-concurrency'):
+    try:
+        PIPELINE = SentimentFinancePipeline()
+        PIPELINE.warm_init()
+    except Exception as e:
+        logger.error(f"Pipeline warm init failed, deferring to first invocation: {str(e)}")
+        PIPELINE = None
 
 
 if __name__ == '__main__':
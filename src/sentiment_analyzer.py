@@ -1,34 +1,68 @@
 """
 SentimentAnalyzer class for text processing and sentiment analysis.
-Uses NLTK and TextBlob for natural language processing.
+Uses the standalone VADER package and financial keyword scoring for natural language processing.
 """
 
 import os
 import re
+import hashlib
 import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property
 from typing import Dict, Tuple, Optional, List
-from textblob import TextBlob
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.stem import WordNetLemmatizer
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from src.finbert_model import FinBertModel, FINBERT_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+# Text cleanup patterns, compiled once at import
+_URL_RE = re.compile(r'https?://\S+')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_WS_RE = re.compile(r'\s+')
+_SPECIAL_RE = re.compile(r'[^\w\s.,!?;:-]')
+
+# English stopwords (the NLTK list), inlined to avoid shipping NLTK corpora
+_STOP_WORDS = frozenset({
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're", "you've",
+    "you'll", "you'd", 'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself',
+    'she', "she's", 'her', 'hers', 'herself', 'it', "it's", 'its', 'itself', 'they', 'them',
+    'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', "that'll",
+    'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has',
+    'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or',
+    'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against',
+    'between', 'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from',
+    'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 'once',
+    'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more',
+    'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
+    'too', 'very', 's', 't', 'can', 'will', 'just', 'don', "don't", 'should', "should've", 'now',
+    'd', 'll', 'm', 'o', 're', 've', 'y', 'ain', 'aren', "aren't", 'couldn', "couldn't", 'didn',
+    "didn't", 'doesn', "doesn't", 'hadn', "hadn't", 'hasn', "hasn't", 'haven', "haven't", 'isn',
+    "isn't", 'ma', 'mightn', "mightn't", 'mustn', "mustn't", 'needn', "needn't", 'shan', "shan't",
+    'shouldn', "shouldn't", 'wasn', "wasn't", 'weren', "weren't", 'won', "won't", 'wouldn',
+    "wouldn't"
+})
+
+# Texts handed to a pool worker per task in analyze_batch
+_BATCH_CHUNKSIZE = 16
+
+# Distinct texts whose results analyze_sentiment remembers
+_RESULT_CACHE_SIZE = 4096
+
 
 class SentimentAnalyzer:
-    """Handles sentiment analysis using NLTK and TextBlob."""
+    """Handles sentiment analysis using VADER and financial keywords."""
 
     def __init__(self):
-        """Initialize SentimentAnalyzer and download required NLTK data."""
-        self._setup_nltk()
-        self.lemmatizer = WordNetLemmatizer()
-        try:
-            self.stop_words = set(stopwords.words('english'))
-        except LookupError:
-            logger.warning("NLTK stopwords not found, downloading...")
-            nltk.download('stopwords', quiet=True)
-            self.stop_words = set(stopwords.words('english'))
+        """Initialize SentimentAnalyzer; models are loaded on first use."""
+        self.stop_words = _STOP_WORDS
+
+        # LRU of results keyed by a digest of the input text
+        self._result_cache = OrderedDict()
+
+        # Worker processes for analyze_batch; 1 keeps analysis in-process
+        self.batch_workers = int(os.getenv('SENTIMENT_WORKERS', '1'))
 
         # Financial keywords that might affect sentiment
         self.financial_keywords = {
@@ -44,24 +78,50 @@ class SentimentAnalyzer:
             ]
         }
 
-    def _setup_nltk(self):
-        """Download and setup required NLTK resources."""
-        required_nltk_data = [
-            'punkt', 'stopwords', 'wordnet', 'vader_lexicon'
-        ]
+        # Keyword polarity (+1/-1) for a single hash lookup per token
+        self._kw_score = {
+            **{word: 1 for word in self.financial_keywords['positive']},
+            **{word: -1 for word in self.financial_keywords['negative']}
+        }
 
-        for resource in required_nltk_data:
-            try:
-                nltk.data.find(f'tokenizers/{resource}')
-            except LookupError:
-                try:
-                    nltk.data.find(f'corpora/{resource}')
-                except LookupError:
-                    try:
-                        nltk.data.find(f'sentiment/{resource}')
-                    except LookupError:
-                        logger.info(f"Downloading NLTK resource: {resource}")
-                        nltk.download(resource, quiet=True)
+        # One alternation over all keywords, scanned in a single regex pass.
+        # Stopword keywords ('up', 'down') were never counted and stay excluded.
+        self._kw_re = re.compile(r'\b(' + '|'.join(
+            re.escape(word) for word in sorted(self._kw_score, key=len, reverse=True)
+            if word not in self.stop_words
+        ) + r')\b')
+
+    @cached_property
+    def _vader(self) -> SentimentIntensityAnalyzer:
+        """VADER analyzer, loading its lexicon once on first use."""
+        return SentimentIntensityAnalyzer()
+
+    @cached_property
+    def _finbert(self) -> Optional[FinBertModel]:
+        """Optional finance-domain model replacing the VADER/keyword blend."""
+        return self._load_finbert(os.getenv('FINBERT_ONNX_DIR'))
+
+    def _load_finbert(self, model_dir: Optional[str]) -> Optional[FinBertModel]:
+        """
+        Load the FinBERT ONNX backend if one is configured.
+
+        Args:
+            model_dir: Exported model directory, or None to disable
+
+        Returns:
+            Loaded model, or None to use VADER and keyword scoring
+        """
+        if not model_dir:
+            return None
+        if not FINBERT_AVAILABLE:
+            logger.warning("FINBERT_ONNX_DIR is set but onnxruntime/tokenizers are not installed")
+            return None
+
+        try:
+            return FinBertModel(model_dir)
+        except Exception as e:
+            logger.error(f"Error loading FinBERT model from {model_dir}: {str(e)}")
+            return None
 
     def analyze_sentiment(self, text: str) -> Dict:
         """
@@ -76,13 +136,36 @@ class SentimentAnalyzer:
         if not text or not text.strip():
             return self._empty_sentiment_result()
 
+        # Cross-posted and re-fetched articles repeat the same text
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            self._result_cache.move_to_end(key)
+            return dict(cached)
+
+        result = self._analyze_uncached(text)
+        self._result_cache[key] = result
+        if len(self._result_cache) > _RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+        return dict(result)
+
+    def _analyze_uncached(self, text: str) -> Dict:
+        """
+        Run the configured sentiment methods on non-empty text.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Dictionary containing sentiment analysis results
+        """
         # Clean and preprocess text
         cleaned_text = self._preprocess_text(text)
 
-        # TextBlob analysis
-        textblob_result = self._analyze_with_textblob(cleaned_text)
+        if self._finbert is not None:
+            return self._finbert.predict([cleaned_text])[0]
 
-        # NLTK VADER analysis
+        # VADER analysis
         vader_result = self._analyze_with_vader(cleaned_text)
 
         # Financial keyword analysis
@@ -90,7 +173,7 @@ class SentimentAnalyzer:
 
         # Combine results with weighted average
         combined_result = self._combine_sentiment_results(
-            textblob_result, vader_result, keyword_result
+            vader_result, keyword_result
         )
 
         return combined_result
@@ -106,56 +189,22 @@ class SentimentAnalyzer:
             Cleaned text
         """
         # Remove URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+        text = _URL_RE.sub('', text)
 
         # Remove email addresses
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', text)
+        text = _EMAIL_RE.sub('', text)
 
         # Remove excessive whitespace and newlines
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
 
         # Remove special characters but keep punctuation that matters for sentiment
-        text = re.sub(r'[^\w\s.,!?;:-]', '', text)
+        text = _SPECIAL_RE.sub('', text)
 
         return text.strip()
 
-    def _analyze_with_textblob(self, text: str) -> Dict:
-        """
-        Analyze sentiment using TextBlob.
-
-        Args:
-            text: Preprocessed text
-
-        Returns:
-            TextBlob sentiment results
-        """
-        try:
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity  # -1 to 1
-            subjectivity = blob.sentiment.subjectivity  # 0 to 1
-
-            # Convert polarity to label
-            if polarity > 0.1:
-                label = 'positive'
-            elif polarity < -0.1:
-                label = 'negative'
-            else:
-                label = 'neutral'
-
-            return {
-                'method': 'textblob',
-                'score': polarity,
-                'confidence': 1 - subjectivity,  # More objective = higher confidence
-                'label': label,
-                'subjectivity': subjectivity
-            }
-        except Exception as e:
-            logger.error(f"TextBlob analysis error: {str(e)}")
-            return self._empty_sentiment_result('textblob')
-
     def _analyze_with_vader(self, text: str) -> Dict:
         """
-        Analyze sentiment using NLTK's VADER.
+        Analyze sentiment using VADER.
 
         Args:
             text: Preprocessed text
@@ -164,10 +213,7 @@ class SentimentAnalyzer:
             VADER sentiment results
         """
         try:
-            from nltk.sentiment import SentimentIntensityAnalyzer
-
-            analyzer = SentimentIntensityAnalyzer()
-            scores = analyzer.polarity_scores(text)
+            scores = self._vader.polarity_scores(text)
 
             compound_score = scores['compound']
 
@@ -207,18 +253,16 @@ class SentimentAnalyzer:
         """
         text_lower = text.lower()
 
-        # Tokenize text
-        tokens = word_tokenize(text_lower)
-        tokens = [token for token in tokens if token not in self.stop_words and token.isalpha()]
-
         positive_count = 0
         negative_count = 0
 
         # Count financial sentiment keywords
-        for token in tokens:
-            if token in self.financial_keywords['positive']:
+        kw_score = self._kw_score
+        for keyword in self._kw_re.findall(text_lower):
+            score = kw_score[keyword]
+            if score == 1:
                 positive_count += 1
-            elif token in self.financial_keywords['negative']:
+            elif score == -1:
                 negative_count += 1
 
         total_keywords = positive_count + negative_count
@@ -250,14 +294,12 @@ class SentimentAnalyzer:
             'total_keywords': total_keywords
         }
 
-    def _combine_sentiment_results(self, textblob_result: Dict,
-                                  vader_result: Dict,
+    def _combine_sentiment_results(self, vader_result: Dict,
                                   keyword_result: Dict) -> Dict:
         """
         Combine multiple sentiment analysis results using weighted average.
 
         Args:
-            textblob_result: TextBlob analysis results
             vader_result: VADER analysis results
             keyword_result: Financial keyword analysis results
 
@@ -266,12 +308,11 @@ class SentimentAnalyzer:
         """
         # Weights for different methods
         weights = {
-            'textblob': 0.4,
-            'vader': 0.4,
-            'financial_keywords': 0.2
+            'vader': 0.7,
+            'financial_keywords': 0.3
         }
 
-        results = [textblob_result, vader_result, keyword_result]
+        results = [vader_result, keyword_result]
 
         # Calculate weighted scores
         total_score = 0
@@ -307,7 +348,6 @@ class SentimentAnalyzer:
             'confidence': final_confidence,
             'sentiment_label': final_label,
             'individual_results': {
-                'textblob': textblob_result,
                 'vader': vader_result,
                 'financial_keywords': keyword_result
             }
@@ -330,36 +370,94 @@ class SentimentAnalyzer:
             'label': 'neutral'
         }
 
-    def analyze_batch(self, texts: List[str]) -> List[Dict]:
+    def analyze_batch(self, texts: List[str], workers: Optional[int] = None) -> List[Dict]:
         """
         Analyze sentiment for multiple texts in batch.
 
+        With more than one worker, texts are scored in a process pool in
+        chunks of _BATCH_CHUNKSIZE. Pools need /dev/shm, which AWS Lambda
+        lacks, so the default is in-process and pool failures fall back
+        to it.
+
         Args:
             texts: List of texts to analyze
+            workers: Worker processes, defaults to SENTIMENT_WORKERS
 
         Returns:
             List of sentiment analysis results
         """
-        results = []
+        workers = self.batch_workers if workers is None else workers
+        results = None
 
-        for i, text in enumerate(texts):
+        if self._finbert is not None:
+            results = self._analyze_batch_with_finbert(texts)
+        elif workers > 1 and len(texts) > _BATCH_CHUNKSIZE:
             try:
-                result = self.analyze_sentiment(text)
-                result['text_index'] = i
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error analyzing text {i}: {str(e)}")
-                result = self._empty_sentiment_result('error')
-                result['text_index'] = i
-                result['error'] = str(e)
-                results.append(result)
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                    results = list(executor.map(_analyze_in_worker, texts, chunksize=_BATCH_CHUNKSIZE))
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning(f"Process pool unavailable, analyzing in-process: {str(e)}")
+                self.batch_workers = 1
+
+        if results is None:
+            results = [self._safe_analyze(text) for text in texts]
+
+        for i, result in enumerate(results):
+            result['text_index'] = i
+
+        return results
+
+    def _analyze_batch_with_finbert(self, texts: List[str]) -> List[Dict]:
+        """
+        Score a batch with FinBERT in as few inference calls as possible.
+
+        Args:
+            texts: List of texts to analyze
+
+        Returns:
+            List of sentiment analysis results
+        """
+        results = [self._empty_sentiment_result() for _ in texts]
+        indexes = [i for i, text in enumerate(texts) if text and text.strip()]
 
+        try:
+            scored = self._finbert.predict([self._preprocess_text(texts[i]) for i in indexes])
+        except Exception as e:
+            logger.error(f"FinBERT batch analysis error: {str(e)}")
+            for i in indexes:
+                results[i] = self._empty_sentiment_result('error')
+                results[i]['error'] = str(e)
+            return results
+
+        for i, result in zip(indexes, scored):
+            results[i] = result
         return results
 
+    def _safe_analyze(self, text: str) -> Dict:
+        """
+        Analyze one text, turning failures into an error result.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Sentiment analysis result
+        """
+        try:
+            return self.analyze_sentiment(text)
+        except Exception as e:
+            logger.error(f"Error analyzing text: {str(e)}")
+            result = self._empty_sentiment_result('error')
+            result['error'] = str(e)
+            return result
+
     def extract_key_phrases(self, text: str, num_phrases: int = 5) -> List[str]:
         """
         Extract key phrases from text using simple NLP techniques.
 
+        Candidate phrases are runs of consecutive non-stopwords, split at
+        punctuation and stopwords (RAKE-style), in order of first appearance.
+
         Args:
             text: Text to extract phrases from
             num_phrases: Number of phrases to return
@@ -371,23 +469,37 @@ class SentimentAnalyzer:
             # Preprocess text
             cleaned_text = self._preprocess_text(text)
 
-            # Tokenize into sentences
-            sentences = sent_tokenize(cleaned_text)
-
-            # Extract noun phrases using TextBlob
-            blob = TextBlob(cleaned_text)
-            noun_phrases = blob.noun_phrases
-
-            # Filter and rank phrases
             phrases = []
-            for phrase in noun_phrases:
-                # Skip very short or very long phrases
-                if 2 <= len(phrase.split()) <= 4:
-                    phrases.append(phrase)
+            # Sentence and clause punctuation both end a phrase
+            for fragment in re.split(r'[.,!?;:]+', cleaned_text.lower()):
+                run = []
+                for word in fragment.split() + [None]:
+                    if word is None or word in self.stop_words or not word.isalpha():
+                        # Skip very short or very long phrases
+                        if 2 <= len(run) <= 4:
+                            phrases.append(' '.join(run))
+                        run = []
+                    else:
+                        run.append(word)
 
             # Return top phrases (could be enhanced with TF-IDF or other ranking)
-            return list(set(phrases))[:num_phrases]
+            return list(dict.fromkeys(phrases))[:num_phrases]
 
         except Exception as e:
             logger.error(f"Error extracting key phrases: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+
+# Analyzer owned by each analyze_batch pool worker, built once per process
+_worker_analyzer = None
+
+
+def _init_worker():
+    """Create the per-process analyzer for a pool worker."""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer()
+
+
+def _analyze_in_worker(text: str) -> Dict:
+    """Analyze one text inside a pool worker."""
+    return _worker_analyzer._safe_analyze(text)
@@ -1,21 +1,30 @@
-from unittest.mock import patch, Mock
+import orjson
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
 from src.data_fetcher import DataFetcher
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 def make_fake_response(articles):
-    mock = Mock()
+    mock = MagicMock()
     mock.raise_for_status = Mock()
-    mock.json = Mock(return_value={
+    mock.read = AsyncMock(return_value=orjson.dumps({
         'status': 'ok',
         'totalResults': len(articles),
         'articles': articles
-    })
+    }))
     return mock
 
 
-@patch('src.data_fetcher.requests.get')
-def test_fetch_financial_news(mock_get):
+def make_fake_session(mock_session_cls, response):
+    session = MagicMock()
+    session.get.return_value.__aenter__.return_value = response
+    mock_session_cls.return_value.__aenter__.return_value = session
+    return session
+
+
+@patch('src.data_fetcher.aiohttp.TCPConnector')
+@patch('src.data_fetcher.aiohttp.ClientSession')
+def test_fetch_financial_news(mock_session_cls, mock_connector):
     # Create a fake article
     article = {
         'title': 'TestCo posts better than expected revenue',
@@ -27,7 +36,7 @@ def test_fetch_financial_news(mock_get):
         'author': 'Reporter'
     }
 
-    mock_get.return_value = make_fake_response([article])
+    make_fake_session(mock_session_cls, make_fake_response([article]))
 
     df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
     results = df.fetch_financial_news(['TestCo'], hours_back=1)
@@ -37,3 +46,234 @@ def test_fetch_financial_news(mock_get):
     a = results[0]
     assert a['title'] == article['title']
     assert 'company_search_term' in a
+
+
+@patch('src.data_fetcher.aiohttp.TCPConnector')
+@patch('src.data_fetcher.aiohttp.ClientSession')
+def test_fetch_financial_news_isolates_company_errors(mock_session_cls, mock_connector):
+    response = make_fake_response([])
+    # Batch query fails first, then each company is fetched separately
+    response.raise_for_status.side_effect = [Exception('Batch failed'), Exception('Rate limited'), None]
+    session = make_fake_session(mock_session_cls, response)
+
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    results = df.fetch_financial_news(['FailCo', 'TestCo'], hours_back=1)
+
+    assert results == []
+    assert session.get.call_count == 3
+
+
+@patch('src.data_fetcher.aiohttp.TCPConnector')
+@patch('src.data_fetcher.aiohttp.ClientSession')
+def test_fetch_financial_news_batches_companies(mock_session_cls, mock_connector):
+    def article(title, url):
+        return {'title': title, 'url': url, 'source': {'name': 'Example News'},
+                'publishedAt': '2024-01-15T10:30:00Z'}
+
+    session = make_fake_session(mock_session_cls, make_fake_response([
+        article('Apple shares climb', 'http://example.com/1'),
+        article('Tesla and Apple trade places', 'http://example.com/2'),
+        article('Oil prices slip', 'http://example.com/3'),
+    ]))
+
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    results = df.fetch_financial_news(['Apple Inc.', 'Tesla Inc.'], hours_back=1)
+
+    assert session.get.call_count == 1
+    params = session.get.call_args.kwargs['params']
+    assert params['q'] == '(apple OR tesla) AND (stock OR market OR business)'
+    assert params['pageSize'] == 100
+    assert sorted((a['url'], a['company_search_term']) for a in results) == [
+        ('http://example.com/1', 'Apple Inc.'),
+        ('http://example.com/2', 'Apple Inc.'),
+        ('http://example.com/2', 'Tesla Inc.'),
+    ]
+
+
+@patch('src.data_fetcher.aiohttp.TCPConnector')
+@patch('src.data_fetcher.aiohttp.ClientSession')
+def test_fetch_financial_news_batch_matches_whole_words(mock_session_cls, mock_connector):
+    def article(title, url):
+        return {'title': title, 'url': url, 'source': {'name': 'Example News'},
+                'publishedAt': '2024-01-15T10:30:00Z'}
+
+    batch_response = make_fake_response([
+        article('Amazon expands its cloud unit', 'http://example.com/amazon'),
+        article('Metal prices climb on demand', 'http://example.com/metal'),
+        article('Apple shares rise', 'http://example.com/apple'),
+    ])
+    meta_response = make_fake_response([article('Meta launches new headset', 'http://example.com/meta')])
+    session = make_fake_session(mock_session_cls, batch_response)
+    requests_made = [MagicMock(), MagicMock()]
+    requests_made[0].__aenter__.return_value = batch_response
+    requests_made[1].__aenter__.return_value = meta_response
+    session.get.side_effect = requests_made
+
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    results = df.fetch_financial_news(['Apple Inc.', 'Amazon.com Inc.', 'Meta Platforms Inc.'], hours_back=1)
+
+    assert sorted((a['url'], a['company_search_term']) for a in results) == [
+        ('http://example.com/amazon', 'Amazon.com Inc.'),
+        ('http://example.com/apple', 'Apple Inc.'),
+        ('http://example.com/meta', 'Meta Platforms Inc.'),
+    ]
+    # Only Meta, left without a whole-word match, is re-queried on its own
+    assert session.get.call_count == 2
+    assert session.get.call_args.kwargs['params']['q'].startswith('meta ')
+
+
+@patch('src.data_fetcher.asyncio.sleep', new_callable=AsyncMock)
+@patch('src.data_fetcher.aiohttp.TCPConnector')
+@patch('src.data_fetcher.aiohttp.ClientSession')
+def test_fetch_financial_news_retries_transient_errors(mock_session_cls, mock_connector, mock_sleep):
+    article = {
+        'title': 'Apple shares climb',
+        'url': 'http://example.com/apple',
+        'source': {'name': 'Example News'},
+        'publishedAt': '2024-01-15T10:30:00Z'
+    }
+    throttled = make_fake_response([])
+    throttled.status = 429
+    ok = make_fake_response([article])
+    ok.status = 200
+    session = make_fake_session(mock_session_cls, ok)
+    requests_made = [MagicMock(), MagicMock()]
+    requests_made[0].__aenter__.return_value = throttled
+    requests_made[1].__aenter__.return_value = ok
+    session.get.side_effect = requests_made
+
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    results = df.fetch_financial_news(['Apple Inc.'], hours_back=1)
+
+    assert [a['url'] for a in results] == ['http://example.com/apple']
+    assert session.get.call_count == 2
+    throttled.raise_for_status.assert_not_called()
+    mock_sleep.assert_awaited_once_with(0.3)
+
+
+def test_process_articles_deduplicates_across_calls():
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    df._seen_cap = 2
+
+    def raw(*urls):
+        return [{'title': 'T', 'publishedAt': '2024-01-15T10:30:00Z', 'url': u} for u in urls]
+
+    first = list(df._process_articles(raw('u1', 'u1', 'u2'), 'testco'))
+    second = list(df._process_articles(raw('u2', 'u3'), 'testco'))
+    # u1 was least recently seen and has been evicted
+    third = list(df._process_articles(raw('u1'), 'testco'))
+
+    assert [a['url'] for a in first] == ['u1', 'u2']
+    assert [a['url'] for a in second] == ['u3']
+    assert [a['url'] for a in third] == ['u1']
+
+
+@patch('src.data_fetcher.aiohttp.TCPConnector')
+@patch('src.data_fetcher.aiohttp.ClientSession')
+def test_fetch_financial_news_deduplicates_search_terms(mock_session_cls, mock_connector):
+    article = {
+        'title': 'Apple shares climb',
+        'url': 'http://example.com/apple',
+        'source': {'name': 'Example News'},
+        'publishedAt': '2024-01-15T10:30:00Z'
+    }
+    session = make_fake_session(mock_session_cls, make_fake_response([article]))
+
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    results = df.fetch_financial_news(['Apple Inc.', 'apple'], hours_back=1)
+
+    assert session.get.call_count == 1
+    assert [a['company_search_term'] for a in results] == ['Apple Inc.', 'apple']
+
+
+@patch('src.data_fetcher.aiohttp.TCPConnector')
+@patch('src.data_fetcher.aiohttp.ClientSession')
+def test_fetch_all_news_prefers_company_attribution(mock_session_cls, mock_connector):
+    article = {
+        'title': 'Apple leads tech stocks higher',
+        'url': 'http://example.com/apple',
+        'source': {'name': 'Example News'},
+        'publishedAt': '2024-01-15T10:30:00Z'
+    }
+    session = make_fake_session(mock_session_cls, make_fake_response([article]))
+
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    results = df.fetch_all_news(['Apple Inc.'], ['technology', 'healthcare'], hours_back=1)
+
+    # One company request plus one per sector, all in the same session
+    assert session.get.call_count == 3
+    assert [a['company_search_term'] for a in results] == ['Apple Inc.']
+
+
+@patch('src.data_fetcher.aiohttp.TCPConnector')
+@patch('src.data_fetcher.aiohttp.ClientSession')
+def test_fetch_all_news_repeats_articles_after_reset(mock_session_cls, mock_connector):
+    article = {
+        'title': 'Apple leads tech stocks higher',
+        'url': 'http://example.com/apple',
+        'source': {'name': 'Example News'},
+        'publishedAt': '2024-01-15T10:30:00Z'
+    }
+    make_fake_session(mock_session_cls, make_fake_response([article]))
+
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    first = df.fetch_all_news(['Apple Inc.'], ['technology'], hours_back=1)
+    # A later call in the same run drops URLs it already returned
+    repeat = df.fetch_financial_news(['Apple Inc.'], hours_back=1)
+    # A warm re-invocation starts a new run and sees the same articles again
+    df.reset_seen_urls()
+    second = df.fetch_all_news(['Apple Inc.'], ['technology'], hours_back=1)
+
+    assert [a['url'] for a in first] == ['http://example.com/apple']
+    assert repeat == []
+    assert second == first
+
+
+def test_fetch_sector_news():
+    article = {
+        'title': 'Tech stocks rally',
+        'url': 'http://example.com/tech',
+        'source': {'name': 'Example News'},
+        'publishedAt': '2024-01-15T10:30:00Z'
+    }
+    response = Mock()
+    response.content = orjson.dumps({'status': 'ok', 'totalResults': 1, 'articles': [article]})
+
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    with patch.object(df.session, 'get', return_value=response) as mock_get:
+        results = df.fetch_sector_news('technology', hours_back=1)
+
+    mock_get.assert_called_once()
+    assert len(results) == 1
+    assert results[0]['company_search_term'] == 'sector:technology'
+
+
+def test_parse_date():
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+
+    fast = df._parse_date('2024-01-15T10:30:45Z')
+    fallback = df._parse_date('2024-01-15T10:30:45.123456Z')
+
+    assert fast == datetime(2024, 1, 15, 10, 30, 45, tzinfo=timezone.utc)
+    assert fallback == datetime(2024, 1, 15, 10, 30, 45, 123456, tzinfo=timezone.utc)
+
+
+def test_process_articles_cleans_fields():
+    df = DataFetcher(api_key='fake-key', base_url='https://fake-api')
+    raw = [{
+        'title': '  Padded title ',
+        'description': None,
+        'content': 'Already trimmed',
+        'url': 'http://example.com/a\n',
+        'source': {'name': 'Example News'},
+        'publishedAt': '2024-01-15T10:30:00Z',
+        'author': '   '
+    }]
+
+    processed = list(df._process_articles(raw, 'testco'))
+
+    assert processed[0]['title'] == 'Padded title'
+    assert processed[0]['description'] == ''
+    assert processed[0]['content'] == 'Already trimmed'
+    assert processed[0]['url'] == 'http://example.com/a'
+    assert processed[0]['author'] is None
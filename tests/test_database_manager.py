@@ -2,6 +2,7 @@ import os
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from datetime import datetime, timedelta
+from mysql.connector import Error
 from src.database_manager import DatabaseManager
 
 
@@ -57,11 +58,11 @@ def test_database_manager_missing_params():
             os.environ['DB_HOST'] = old_host
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_insert_company(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_insert_company(mock_pool, db_manager, mock_db_connection):
     """Test inserting a company into the database."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
     mock_cursor.lastrowid = 123
     mock_cursor.fetchone.return_value = None  # Company doesn't exist
 
@@ -76,24 +77,59 @@ def test_insert_company(mock_connect, db_manager, mock_db_connection):
     mock_conn.commit.assert_called()
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_get_company_id_exists(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_get_company_id_exists(mock_pool, db_manager, mock_db_connection):
     """Test retrieving an existing company ID."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
     mock_cursor.fetchone.return_value = (42,)
 
     company_id = db_manager.get_company_id('Existing Corp')
+    cached_id = db_manager.get_company_id('Existing Corp')
 
-    assert company_id == 42
+    assert company_id == cached_id == 42
     mock_cursor.execute.assert_called_once()
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_get_company_id_not_exists(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_get_company_ids(mock_pool, db_manager, mock_db_connection):
+    """Test looking up several company IDs in one round-trip."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [('Apple Inc.', 1)]
+
+    company_ids = db_manager.get_company_ids(['Apple Inc.', 'New Corp'])
+
+    assert company_ids == {'Apple Inc.': 1}
+    mock_cursor.execute.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_prime_company_cache(mock_pool, db_manager, mock_db_connection):
+    """Test that priming loads all known companies in one query."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [('Apple Inc.', 1), ('Tesla Inc.', 2)]
+
+    primed = db_manager.prime_company_cache(['Apple Inc.', 'Tesla Inc.', 'New Corp'])
+
+    assert primed == 2
+    query, params = mock_cursor.execute.call_args[0]
+    assert 'WHERE name IN (%s,%s,%s)' in query
+    assert params == ('Apple Inc.', 'Tesla Inc.', 'New Corp')
+
+    # Cached names need no further round-trips
+    assert db_manager.insert_company('Apple Inc.', 'Technology') == 1
+    assert db_manager.get_company_id('Tesla Inc.') == 2
+    assert db_manager.prime_company_cache(['Apple Inc.']) == 0
+    mock_cursor.execute.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_get_company_id_not_exists(mock_pool, db_manager, mock_db_connection):
     """Test retrieving a non-existent company returns None."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
     mock_cursor.fetchone.return_value = None
 
     company_id = db_manager.get_company_id('NonExistent Corp')
@@ -101,11 +137,11 @@ def test_get_company_id_not_exists(mock_connect, db_manager, mock_db_connection)
     assert company_id is None
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_insert_article(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_insert_article(mock_pool, db_manager, mock_db_connection):
     """Test inserting an article into the database."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
     mock_cursor.lastrowid = 456
     mock_cursor.fetchone.return_value = None  # Article doesn't exist
 
@@ -124,23 +160,48 @@ def test_insert_article(mock_connect, db_manager, mock_db_connection):
     mock_conn.commit.assert_called()
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_article_exists(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_article_exists(mock_pool, db_manager, mock_db_connection):
     """Test checking if an article exists."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
-    mock_cursor.fetchone.return_value = (1,)
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [('https://example.com/existing', 1)]
 
     exists = db_manager.article_exists('https://example.com/existing')
 
     assert exists is True
+    assert 'WHERE url IN (%s)' in mock_cursor.execute.call_args[0][0]
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_insert_sentiment_score(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_article_does_not_exist(mock_pool, db_manager, mock_db_connection):
+    """Test that an empty lookup reports a missing article."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = []
+
+    assert db_manager.article_exists('https://example.com/missing') is False
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_filter_new_urls(mock_pool, db_manager, mock_db_connection):
+    """Test that stored URLs are filtered out with one IN query."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [('https://example.com/old', 1)]
+
+    new_urls = db_manager.filter_new_urls(['https://example.com/old', 'https://example.com/new'])
+
+    assert new_urls == {'https://example.com/new'}
+    mock_cursor.execute.assert_called_once()
+    assert 'WHERE url IN (%s,%s)' in mock_cursor.execute.call_args[0][0]
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_insert_sentiment_score(mock_pool, db_manager, mock_db_connection):
     """Test inserting sentiment score into the database."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
     mock_cursor.lastrowid = 789
 
     sentiment_id = db_manager.insert_sentiment_score(
@@ -155,11 +216,11 @@ def test_insert_sentiment_score(mock_connect, db_manager, mock_db_connection):
     mock_conn.commit.assert_called()
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_get_weekly_sentiment_report(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_get_weekly_sentiment_report(mock_pool, db_manager, mock_db_connection):
     """Test retrieving weekly sentiment report with complex SQL."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
 
     # Mock result data
     mock_results = [
@@ -188,11 +249,11 @@ def test_get_weekly_sentiment_report(mock_connect, db_manager, mock_db_connectio
     mock_cursor.execute.assert_called_once()
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_get_sector_sentiment_analysis(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_get_sector_sentiment_analysis(mock_pool, db_manager, mock_db_connection):
     """Test sector sentiment analysis with subqueries."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
 
     mock_results = [
         {
@@ -211,13 +272,15 @@ def test_get_sector_sentiment_analysis(mock_connect, db_manager, mock_db_connect
     assert len(analysis) == 1
     assert analysis[0]['sector'] == 'Technology'
     assert analysis[0]['total_articles'] == 50
+    # Shared CTE means the sector/date filter is bound only once
+    assert mock_cursor.execute.call_args[0][1] == ('Technology', 30)
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_get_trending_companies(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_get_trending_companies(mock_pool, db_manager, mock_db_connection):
     """Test retrieving trending companies."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
 
     mock_results = [
         {'name': 'Tesla Inc.', 'sector': 'Automotive', 'article_count': 25, 'avg_sentiment': 0.6},
@@ -232,11 +295,46 @@ def test_get_trending_companies(mock_connect, db_manager, mock_db_connection):
     assert trending[0]['article_count'] == 25
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_execute_custom_query_select(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_get_trending_companies_stream(mock_pool, db_manager, mock_db_connection):
+    """Test streaming trending companies with an unbuffered cursor."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchmany.side_effect = [
+        [{'name': 'Tesla Inc.', 'article_count': 25}],
+        [{'name': 'Apple Inc.', 'article_count': 20}],
+        []
+    ]
+
+    trending = db_manager.get_trending_companies(limit=10, stream=True)
+    mock_conn.cursor.assert_not_called()
+
+    assert [row['name'] for row in trending] == ['Tesla Inc.', 'Apple Inc.']
+    mock_conn.cursor.assert_called_once_with(dictionary=True, buffered=False)
+    mock_cursor.fetchall.assert_not_called()
+    mock_cursor.close.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_get_weekly_sentiment_report_stream(mock_pool, db_manager, mock_db_connection):
+    """Test streaming the weekly report bypasses fetchall and the report cache."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchmany.side_effect = [[{'company_name': 'Apple Inc.', 'article_count': 10}], []]
+
+    report = list(db_manager.get_weekly_sentiment_report('Apple Inc.', stream=True))
+
+    assert report == [{'company_name': 'Apple Inc.', 'article_count': 10}]
+    mock_conn.cursor.assert_called_once_with(dictionary=True, buffered=False)
+    assert mock_cursor.execute.call_args[0][1] == ('Apple Inc.',)
+    mock_cursor.fetchall.assert_not_called()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_execute_custom_query_select(mock_pool, db_manager, mock_db_connection):
     """Test executing a custom SELECT query."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
 
     mock_results = [{'id': 1, 'name': 'Test'}]
     mock_cursor.fetchall.return_value = mock_results
@@ -247,11 +345,11 @@ def test_execute_custom_query_select(mock_connect, db_manager, mock_db_connectio
     assert results[0]['id'] == 1
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_cleanup_old_articles(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_cleanup_old_articles(mock_pool, db_manager, mock_db_connection):
     """Test cleaning up old articles."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
     mock_cursor.rowcount = 15
 
     deleted_count = db_manager.cleanup_old_articles(days_to_keep=90)
@@ -260,10 +358,10 @@ def test_cleanup_old_articles(mock_connect, db_manager, mock_db_connection):
     mock_conn.commit.assert_called()
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_connection_error_handling(mock_connect, db_manager):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_connection_error_handling(mock_pool, db_manager):
     """Test error handling when database connection fails."""
-    mock_connect.side_effect = Exception('Connection failed')
+    mock_pool.return_value.get_connection.side_effect = Exception('Connection failed')
 
     with pytest.raises(Exception) as excinfo:
         db_manager.insert_company('Test', 'Technology')
@@ -275,11 +373,11 @@ def test_connection_error_handling(mock_connect, db_manager):
 # The rollback functionality is verified through integration testing
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_context_manager_closes_connection(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_context_manager_closes_connection(mock_pool, db_manager, mock_db_connection):
     """Test that context manager properly closes connection."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
 
     with db_manager.get_connection() as conn:
         pass
@@ -287,11 +385,11 @@ def test_context_manager_closes_connection(mock_connect, db_manager, mock_db_con
     mock_conn.close.assert_called_once()
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_get_article_id_by_url(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_get_article_id_by_url(mock_pool, db_manager, mock_db_connection):
     """Test retrieving article ID by URL."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
     mock_cursor.fetchone.return_value = (99,)
 
     article_id = db_manager.get_article_id_by_url('https://example.com/test')
@@ -299,18 +397,345 @@ def test_get_article_id_by_url(mock_connect, db_manager, mock_db_connection):
     assert article_id == 99
 
 
-@patch('src.database_manager.mysql.connector.connect')
-def test_insert_duplicate_company_returns_existing_id(mock_connect, db_manager, mock_db_connection):
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_insert_duplicate_company_returns_existing_id(mock_pool, db_manager, mock_db_connection):
     """Test inserting duplicate company returns existing ID."""
     mock_conn, mock_cursor = mock_db_connection
-    mock_connect.return_value = mock_conn
+    mock_pool.return_value.get_connection.return_value = mock_conn
 
-    # First call to check if exists returns an ID
-    mock_cursor.fetchone.return_value = (10,)
+    # ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id) reports the existing ID
+    mock_cursor.lastrowid = 10
 
     company_id = db_manager.insert_company('Existing Corp', 'Technology')
 
-    # Should return existing ID without insert
     assert company_id == 10
-    # Commit should not be called for existing company
-    assert mock_conn.commit.call_count == 0
\ No newline at end of file
+    # Single upsert statement, no separate existence check; the idempotent
+    # upsert is committed even when the company already exists
+    mock_cursor.execute.assert_called_once()
+    assert 'ON DUPLICATE KEY UPDATE' in mock_cursor.execute.call_args[0][0]
+    mock_conn.commit.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_insert_articles_bulk(mock_pool, db_manager, mock_db_connection):
+    """Test bulk inserting articles skips existing URLs and returns all IDs."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.side_effect = [
+        [('https://example.com/existing', 1)],
+        [('https://example.com/new', 2)]
+    ]
+
+    articles = [
+        {
+            'title': title,
+            'content': 'Content',
+            'url': url,
+            'source': 'Example News',
+            'published_at': datetime.now(),
+            'company_id': 1
+        }
+        for title, url in [('Existing', 'https://example.com/existing'),
+                           ('New', 'https://example.com/new')]
+    ]
+
+    article_ids = db_manager.insert_articles_bulk(articles)
+
+    assert article_ids == {'https://example.com/existing': 1, 'https://example.com/new': 2}
+    inserted_rows = mock_cursor.executemany.call_args[0][1]
+    assert len(inserted_rows) == 1
+    assert inserted_rows[0][3] == 'https://example.com/new'
+    # created_at is left to the column default
+    assert len(inserted_rows[0]) == 8
+    mock_conn.commit.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_insert_sentiment_scores_bulk(mock_pool, db_manager, mock_db_connection):
+    """Test bulk inserting sentiment scores uses a single executemany."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+
+    mock_cursor.fetchone.return_value = (64 * 1024 * 1024,)
+
+    inserted = db_manager.insert_sentiment_scores_bulk([
+        {'article_id': 1, 'sentiment_score': 0.5, 'confidence': 0.8,
+         'sentiment_label': 'positive', 'processing_method': 'combined'},
+        {'article_id': 2, 'sentiment_score': -0.5, 'confidence': 0.7,
+         'sentiment_label': 'negative', 'processing_method': 'combined'}
+    ])
+
+    assert inserted == 2
+    mock_cursor.executemany.assert_called_once()
+    mock_conn.commit.assert_called_once()
+
+
+@patch('src.database_manager._BULK_CHUNK_SIZE', 2)
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_bulk_inserts_are_chunked(mock_pool, db_manager, mock_db_connection):
+    """Test bulk inserts issue one multi-row INSERT per chunk."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = []
+    mock_cursor.fetchone.return_value = (64 * 1024 * 1024,)
+
+    articles = [
+        {
+            'title': f'Article {i}',
+            'url': f'https://example.com/{i}',
+            'source': 'Example News',
+            'published_at': datetime.now(),
+            'company_id': 1
+        }
+        for i in range(3)
+    ]
+    db_manager.insert_articles_bulk(articles)
+
+    assert [len(call[0][1]) for call in mock_cursor.executemany.call_args_list] == [2, 1]
+    mock_conn.commit.assert_called_once()
+
+    mock_cursor.executemany.reset_mock()
+    db_manager.insert_sentiment_scores_bulk([
+        {'article_id': i, 'sentiment_score': 0.1, 'confidence': 0.5, 'sentiment_label': 'neutral'}
+        for i in range(5)
+    ])
+
+    assert [len(call[0][1]) for call in mock_cursor.executemany.call_args_list] == [2, 2, 1]
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_bulk_insert_chunks_by_packet(mock_pool, db_manager, mock_db_connection):
+    """Test rows too large to share a packet go out in separate INSERTs."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = []
+    # An 800-byte budget fits one ~600-byte article but three small score rows
+    mock_cursor.fetchone.return_value = (1000,)
+
+    articles = [
+        {
+            'title': f'Article {i}',
+            'content': 'x' * 350,
+            'url': f'https://example.com/{i}',
+            'source': 'Example News',
+            'published_at': datetime.now(),
+            'company_id': 1
+        }
+        for i in range(3)
+    ]
+    db_manager.insert_articles_bulk(articles)
+    db_manager.insert_sentiment_scores_bulk([
+        {'article_id': i, 'sentiment_score': 0.1, 'confidence': 0.5, 'sentiment_label': 'neutral'}
+        for i in range(3)
+    ])
+
+    chunk_sizes = [len(call[0][1]) for call in mock_cursor.executemany.call_args_list]
+    assert chunk_sizes == [1, 1, 1, 3]
+    # The server variable is read only once per instance
+    packet_queries = [call for call in mock_cursor.execute.call_args_list
+                      if 'max_allowed_packet' in call[0][0]]
+    assert len(packet_queries) == 1
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_connection_pool_created_once(mock_pool, db_manager, mock_db_connection):
+    """Test that the connection pool is created lazily and reused."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchone.return_value = (1,)
+
+    mock_pool.assert_not_called()
+
+    db_manager.get_company_id('Apple Inc.')
+    db_manager.get_article_id_by_url('https://example.com/test')
+
+    mock_pool.assert_called_once()
+    assert mock_pool.return_value.get_connection.call_count == 2
+    assert mock_conn.close.call_count == 2
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_article_exists_skips_query_on_bloom_miss(mock_pool, db_manager, mock_db_connection):
+    """Test that a warmed Bloom filter answers misses without a SELECT."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchmany.side_effect = [[('https://example.com/existing',)], []]
+
+    loaded = db_manager.warmup_url_bloom()
+    mock_cursor.execute.reset_mock()
+
+    assert loaded == 1
+    assert db_manager.article_exists('https://example.com/new') is False
+    mock_cursor.execute.assert_not_called()
+
+    mock_cursor.fetchall.return_value = [('https://example.com/existing', 1)]
+    assert db_manager.article_exists('https://example.com/existing') is True
+    mock_cursor.execute.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_refresh_daily_rollup(mock_pool, db_manager, mock_db_connection):
+    """Test refreshing the daily sentiment rollup rebuilds recent days."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.rowcount = 14
+
+    affected = db_manager.refresh_daily_rollup(days=7)
+
+    assert affected == 14
+    (delete_query, delete_params), (query, params) = [c.args for c in mock_cursor.execute.call_args_list]
+    assert delete_query.startswith('DELETE FROM daily_sentiment_rollup')
+    assert delete_params == (7,)
+    assert 'INSERT INTO daily_sentiment_rollup' in query
+    assert params == (7,)
+    mock_conn.commit.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_prune_daily_rollup(mock_pool, db_manager, mock_db_connection):
+    """Test pruning drops rollup days older than the retention window."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.rowcount = 3
+
+    assert db_manager.prune_daily_rollup(days_to_keep=90) == 3
+    query, params = mock_cursor.execute.call_args[0]
+    assert 'DELETE FROM daily_sentiment_rollup' in query
+    assert params == (90,)
+    mock_conn.commit.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_cleanup_old_articles_in_batches(mock_pool, db_manager, mock_db_connection):
+    """Test cleanup deletes in batches until a partial batch is returned."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    rowcounts = iter([100, 100, 40])
+    mock_cursor.execute.side_effect = lambda *args: setattr(mock_cursor, 'rowcount', next(rowcounts))
+
+    deleted_count = db_manager.cleanup_old_articles(days_to_keep=90, batch_size=100)
+
+    assert deleted_count == 240
+    mock_conn.cursor.assert_called_once_with(prepared=True)
+    assert mock_cursor.execute.call_count == 3
+    assert mock_conn.commit.call_count == 3
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_company_id_cache(mock_pool, db_manager, mock_db_connection):
+    """Test company IDs are cached after insert and lookup."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.lastrowid = 7
+
+    assert db_manager.insert_company('Cached Corp', 'Technology') == 7
+    assert db_manager.get_company_id('Cached Corp') == 7
+    assert db_manager.insert_company('Cached Corp', 'Technology') == 7
+    mock_cursor.execute.assert_called_once()
+
+    mock_cursor.fetchall.return_value = [(1, 'Apple Inc.')]
+    assert db_manager.refresh_companies() == 1
+    assert db_manager.get_company_id('Apple Inc.') == 1
+    assert mock_cursor.execute.call_count == 2
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_batch_transaction_commits_once(mock_pool, db_manager, mock_db_connection):
+    """Test that bulk writes inside batch_transaction share one commit."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [('https://example.com/a', 5)]
+
+    with db_manager.batch_transaction() as conn:
+        article_ids = db_manager.insert_articles_bulk([{
+            'title': 'A', 'content': '', 'url': 'https://example.com/a', 'source': 'Test',
+            'published_at': datetime.now(), 'company_id': 1
+        }], connection=conn)
+        db_manager.insert_sentiment_scores_bulk([{
+            'article_id': article_ids['https://example.com/a'], 'sentiment_score': 0.5,
+            'confidence': 0.8, 'sentiment_label': 'positive'
+        }], connection=conn)
+
+    assert mock_pool.return_value.get_connection.call_count == 1
+    mock_conn.commit.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_batch_transaction_rolls_back_on_error(mock_pool, db_manager, mock_db_connection):
+    """Test that a failure inside batch_transaction rolls back and skips the commit."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+
+    with pytest.raises(ValueError):
+        with db_manager.batch_transaction():
+            raise ValueError('scoring failed')
+
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_not_called()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_savepoint_rolls_back_only_its_own_writes(mock_pool, db_manager, mock_db_connection):
+    """Test that a failing row rolls back to its savepoint and the batch still commits."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+
+    with db_manager.batch_transaction() as conn:
+        with db_manager.savepoint(conn):
+            pass
+        with pytest.raises(Error):
+            with db_manager.savepoint(conn):
+                raise Error('Data too long for column url')
+
+    statements = [call.args[0] for call in mock_cursor.execute.call_args_list]
+    assert statements == [
+        'SAVEPOINT batch_row', 'RELEASE SAVEPOINT batch_row',
+        'SAVEPOINT batch_row', 'ROLLBACK TO SAVEPOINT batch_row'
+    ]
+    mock_conn.commit.assert_called_once()
+    mock_conn.rollback.assert_not_called()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_report_cache_reuses_results_until_rollup_refresh(mock_pool, db_manager, mock_db_connection):
+    """Test that repeated reports are served from cache until the data changes."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [{'company_name': 'Apple Inc.', 'avg_sentiment': 0.65}]
+
+    first = db_manager.get_weekly_sentiment_report('Apple Inc.')
+    first[0]['avg_sentiment'] = 0.0
+    second = db_manager.get_weekly_sentiment_report('Apple Inc.')
+
+    # Callers get copies, so mutating one result does not poison the cache
+    assert second == [{'company_name': 'Apple Inc.', 'avg_sentiment': 0.65}]
+    assert mock_cursor.execute.call_count == 1
+
+    db_manager.get_sector_sentiment_analysis('Technology', days_back=30)
+    db_manager.get_sector_sentiment_analysis('Technology', days_back=30)
+    assert mock_cursor.execute.call_count == 2
+
+    # The refresh deletes and rebuilds, then the report is read again
+    db_manager.refresh_daily_rollup(days=7)
+    db_manager.get_weekly_sentiment_report('Apple Inc.')
+    assert mock_cursor.execute.call_count == 5
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_report_cache_cleared_by_committed_batch(mock_pool, db_manager, mock_db_connection):
+    """Test that a committed batch of inserts clears cached sector reports."""
+    mock_conn, mock_cursor = mock_db_connection
+    mock_pool.return_value.get_connection.return_value = mock_conn
+    mock_cursor.fetchall.return_value = [{'sector': 'Technology', 'total_articles': 50}]
+
+    db_manager.get_sector_sentiment_analysis('Technology', days_back=30)
+    with pytest.raises(ValueError):
+        with db_manager.batch_transaction():
+            raise ValueError('rolled back')
+    db_manager.get_sector_sentiment_analysis('Technology', days_back=30)
+    assert mock_cursor.execute.call_count == 1
+
+    with db_manager.batch_transaction():
+        pass
+    db_manager.get_sector_sentiment_analysis('Technology', days_back=30)
+    assert mock_cursor.execute.call_count == 2
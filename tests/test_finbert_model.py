@@ -0,0 +1,34 @@
+import pytest
+from unittest.mock import Mock
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('onnxruntime')
+pytest.importorskip('tokenizers')
+
+from src.finbert_model import FinBertModel
+
+
+def make_model(logits):
+    model = FinBertModel.__new__(FinBertModel)
+    model.labels = ['positive', 'negative', 'neutral']
+    model.input_names = {'input_ids', 'attention_mask'}
+    encoding = Mock(ids=[101, 102], attention_mask=[1, 1], type_ids=[0, 0])
+    model.tokenizer = Mock()
+    model.tokenizer.encode_batch.side_effect = lambda texts: [encoding] * len(texts)
+    model.session = Mock()
+    model.session.run.return_value = [np.array(logits, dtype=np.float32)]
+    return model
+
+
+def test_predict_maps_logits_to_results():
+    model = make_model([[4.0, 0.0, 0.0], [0.0, 4.0, 0.0]])
+
+    results = model.predict(['Profits soar', 'Shares plunge'])
+
+    assert [r['sentiment_label'] for r in results] == ['positive', 'negative']
+    assert results[0]['sentiment_score'] > 0.9
+    assert results[1]['sentiment_score'] < -0.9
+    assert results[0]['method'] == 'finbert'
+    # token_type_ids is not an input of this export and must not be fed
+    feed = model.session.run.call_args[0][1]
+    assert set(feed) == {'input_ids', 'attention_mask'}
@@ -1,7 +1,17 @@
+import json
+import threading
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock, patch, call
 from datetime import datetime
 from src.lambda_handler import SentimentFinancePipeline, lambda_handler, local_test_handler
+from src.database_manager import DatabaseManager
+
+
+@pytest.fixture(autouse=True)
+def reset_cached_pipeline():
+    """Drop the pipeline cached across warm invocations between tests."""
+    with patch('src.lambda_handler.PIPELINE', None):
+        yield
 
 
 @pytest.fixture
@@ -11,6 +21,10 @@ def mock_pipeline_components():
          patch('src.lambda_handler.DatabaseManager') as mock_db, \
          patch('src.lambda_handler.SentimentAnalyzer') as mock_analyzer:
 
+        # Nothing is stored yet unless a test says otherwise
+        mock_db.return_value.filter_new_urls.side_effect = lambda urls: set(urls)
+        mock_db.return_value.get_company_ids.return_value = {}
+
         yield {
             'fetcher': mock_fetcher,
             'db': mock_db,
@@ -28,14 +42,25 @@ def test_pipeline_initialization(mock_pipeline_components):
     assert len(pipeline.tracked_companies) == 10
 
 
+def test_pipeline_warm_init_primes_analyzer(mock_pipeline_components):
+    """Test warm init exercises the analyzer without touching the database."""
+    pipeline = SentimentFinancePipeline()
+
+    pipeline.warm_init()
+
+    pipeline.sentiment_analyzer.analyze_sentiment.assert_called_once()
+    pipeline.db_manager.assert_not_called()
+    assert pipeline.db_manager.method_calls == []
+
+
 def test_pipeline_process_success(mock_pipeline_components):
     """Test successful pipeline execution."""
     pipeline = SentimentFinancePipeline()
 
     # Mock database operations
     pipeline.db_manager.insert_company = Mock(return_value=1)
-    pipeline.db_manager.insert_article = Mock(return_value=100)
-    pipeline.db_manager.insert_sentiment_score = Mock(return_value=200)
+    pipeline.db_manager.insert_articles_bulk = Mock(return_value={'https://example.com/test': 100})
+    pipeline.db_manager.insert_sentiment_scores_bulk = Mock(return_value=1)
 
     # Mock data fetcher
     mock_article = {
@@ -48,16 +73,15 @@ def test_pipeline_process_success(mock_pipeline_components):
         'description': 'Test description',
         'author': 'Test Author'
     }
-    pipeline.data_fetcher.fetch_financial_news = Mock(return_value=[mock_article])
-    pipeline.data_fetcher.fetch_sector_news = Mock(return_value=[])
+    pipeline.data_fetcher.fetch_all_news = Mock(return_value=[mock_article])
 
     # Mock sentiment analyzer
-    pipeline.sentiment_analyzer.analyze_sentiment = Mock(return_value={
+    pipeline.sentiment_analyzer.analyze_batch = Mock(return_value=[{
         'sentiment_score': 0.5,
         'confidence': 0.8,
         'sentiment_label': 'positive',
         'method': 'combined'
-    })
+    }])
 
     result = pipeline.process_pipeline('scheduled')
 
@@ -65,6 +89,41 @@ def test_pipeline_process_success(mock_pipeline_components):
     assert result['companies_processed'] == 10
     assert result['articles_fetched'] > 0
     assert result['articles_processed'] > 0
+    pipeline.db_manager.insert_articles_bulk.assert_called_once()
+    # Both bulk inserts run in the batch's single transaction
+    conn = pipeline.db_manager.batch_transaction.return_value.__enter__.return_value
+    assert pipeline.db_manager.insert_articles_bulk.call_args.kwargs['connection'] is conn
+    pipeline.db_manager.insert_sentiment_scores_bulk.assert_called_once_with([{
+        'article_id': 100,
+        'sentiment_score': 0.5,
+        'confidence': 0.8,
+        'sentiment_label': 'positive',
+        'processing_method': 'combined'
+    }], connection=conn)
+
+
+def test_pipeline_process_overlaps_company_setup_with_fetch(mock_pipeline_components):
+    """Test companies are set up while news is still being fetched."""
+    pipeline = SentimentFinancePipeline()
+    fetch_started = threading.Event()
+
+    def fetch_all_news(**kwargs):
+        fetch_started.set()
+        return []
+
+    def insert_company(**kwargs):
+        # Serial execution would time out here, before the fetch begins
+        if not fetch_started.wait(5):
+            raise TimeoutError('company setup ran before the fetch')
+        return 1
+
+    pipeline.db_manager.insert_company = Mock(side_effect=insert_company)
+    pipeline.data_fetcher.fetch_all_news = Mock(side_effect=fetch_all_news)
+
+    result = pipeline.process_pipeline('scheduled')
+
+    assert result['companies_processed'] == 10
+    assert result['articles_fetched'] == 0
 
 
 def test_pipeline_process_no_articles(mock_pipeline_components):
@@ -72,8 +131,7 @@ def test_pipeline_process_no_articles(mock_pipeline_components):
     pipeline = SentimentFinancePipeline()
 
     pipeline.db_manager.insert_company = Mock(return_value=1)
-    pipeline.data_fetcher.fetch_financial_news = Mock(return_value=[])
-    pipeline.data_fetcher.fetch_sector_news = Mock(return_value=[])
+    pipeline.data_fetcher.fetch_all_news = Mock(return_value=[])
 
     result = pipeline.process_pipeline('scheduled')
 
@@ -94,6 +152,23 @@ def test_pipeline_setup_companies(mock_pipeline_components):
     assert 'Tesla Inc.' in company_ids
 
 
+def test_pipeline_setup_companies_inserts_only_missing(mock_pipeline_components):
+    """Test companies already in the database are not upserted again."""
+    pipeline = SentimentFinancePipeline()
+
+    existing = {company['name']: i for i, company in enumerate(pipeline.tracked_companies[:8], 1)}
+    pipeline.db_manager.get_company_ids = Mock(return_value=dict(existing))
+    pipeline.db_manager.insert_company = Mock(side_effect=[9, 10])
+
+    company_ids = pipeline._setup_companies()
+
+    assert len(company_ids) == 10
+    pipeline.db_manager.get_company_ids.assert_called_once()
+    assert [call.kwargs['name'] for call in pipeline.db_manager.insert_company.call_args_list] == [
+        company['name'] for company in pipeline.tracked_companies[8:]
+    ]
+
+
 def test_pipeline_fetch_all_news_articles(mock_pipeline_components):
     """Test fetching news from multiple sources."""
     pipeline = SentimentFinancePipeline()
@@ -101,12 +176,47 @@ def test_pipeline_fetch_all_news_articles(mock_pipeline_components):
     mock_article_1 = {'title': 'Article 1', 'url': 'https://example.com/1'}
     mock_article_2 = {'title': 'Article 2', 'url': 'https://example.com/2'}
 
-    pipeline.data_fetcher.fetch_financial_news = Mock(return_value=[mock_article_1])
-    pipeline.data_fetcher.fetch_sector_news = Mock(return_value=[mock_article_2])
+    pipeline.data_fetcher.fetch_all_news = Mock(return_value=[mock_article_1, mock_article_2])
 
-    articles = pipeline._fetch_all_news_articles()
+    articles = list(pipeline._fetch_all_news_articles())
+
+    assert len(articles) == 2
+    kwargs = pipeline.data_fetcher.fetch_all_news.call_args.kwargs
+    assert len(kwargs['companies']) == 10
+    assert kwargs['sectors'] == ['technology', 'automotive', 'financial services', 'healthcare']
+    # Each run starts a fresh URL deduplication round
+    pipeline.data_fetcher.reset_seen_urls.assert_called_once()
+
+
+def test_pipeline_fetch_all_news_articles_follows_tracked_companies(mock_pipeline_components):
+    """Test sector searches reflect companies assigned after construction."""
+    pipeline = SentimentFinancePipeline()
+    pipeline.tracked_companies = [{'name': 'Pfizer Inc.', 'sector': 'Healthcare', 'symbol': 'PFE'}]
+    pipeline.data_fetcher.fetch_all_news = Mock(return_value=[])
+
+    list(pipeline._fetch_all_news_articles())
+
+    kwargs = pipeline.data_fetcher.fetch_all_news.call_args.kwargs
+    assert kwargs['companies'] == ['Pfizer Inc.']
+    assert kwargs['sectors'] == ['healthcare']
 
-    assert len(articles) >= 2
+
+def test_pipeline_fetch_all_news_articles_deduplicates_urls(mock_pipeline_components):
+    """Test a story returned by company and sector searches is yielded once."""
+    pipeline = SentimentFinancePipeline()
+
+    pipeline.data_fetcher.fetch_all_news = Mock(return_value=[
+        {'title': 'Apple rallies', 'url': 'https://example.com/1', 'company_search_term': 'Apple Inc.'},
+        {'title': 'Apple rallies', 'url': 'https://example.com/1', 'company_search_term': 'sector:technology'},
+        {'title': 'Chips slide', 'url': 'https://example.com/2', 'company_search_term': 'sector:technology'}
+    ])
+
+    articles = list(pipeline._fetch_all_news_articles())
+
+    assert [(a['url'], a['company_search_term']) for a in articles] == [
+        ('https://example.com/1', 'Apple Inc.'),
+        ('https://example.com/2', 'sector:technology')
+    ]
 
 
 def test_pipeline_determine_company_id_by_search_term(mock_pipeline_components):
@@ -155,6 +265,45 @@ def test_pipeline_determine_company_id_by_symbol(mock_pipeline_components):
     assert company_id == 2
 
 
+def test_pipeline_determine_company_id_first_mention_wins(mock_pipeline_components):
+    """Test the first company mentioned in the text is chosen."""
+    pipeline = SentimentFinancePipeline()
+
+    company_ids = {'Apple Inc.': 1, 'Tesla Inc.': 2}
+    article = {
+        'company_search_term': '',
+        'title': 'Tesla outpaces Apple in EV push',
+        'description': None,
+        'content': ''
+    }
+
+    assert pipeline._determine_company_id(article, company_ids) == 2
+    keyword_to_id = pipeline._keyword_to_id
+    # Same company mapping reuses the built keyword map
+    assert pipeline._determine_company_id({'title': 'Nothing relevant'}, company_ids) is None
+    assert pipeline._keyword_to_id is keyword_to_id
+
+
+def test_pipeline_determine_company_id_ignores_generic_words(mock_pipeline_components):
+    """Test shared and generic name words do not attribute an article."""
+    pipeline = SentimentFinancePipeline()
+
+    company_ids = {'Microsoft Corporation': 1, 'NVIDIA Corporation': 2, 'Tesla Inc.': 3}
+    article = {'title': 'Another Corporation Inc. posts results', 'content': 'Metabolism study'}
+
+    assert pipeline._determine_company_id(article, company_ids) is None
+
+
+def test_pipeline_determine_company_id_matches_whole_words(mock_pipeline_components):
+    """Test company keywords do not match inside longer words."""
+    pipeline = SentimentFinancePipeline()
+
+    company_ids = {'Meta Platforms Inc.': 6}
+
+    assert pipeline._determine_company_id({'title': 'Metabolism research funding grows'}, company_ids) is None
+    assert pipeline._determine_company_id({'title': 'Meta shares jump'}, company_ids) == 6
+
+
 def test_pipeline_prepare_text_for_analysis(mock_pipeline_components):
     """Test text preparation for sentiment analysis."""
     pipeline = SentimentFinancePipeline()
@@ -189,6 +338,15 @@ def test_pipeline_prepare_text_truncates_long_content(mock_pipeline_components):
     assert '...' in text
 
 
+def test_pipeline_prepare_text_skips_empty_parts(mock_pipeline_components):
+    """Test that missing fields leave no extra spaces in the analysis text."""
+    pipeline = SentimentFinancePipeline()
+
+    assert pipeline._prepare_text_for_analysis({'title': 'Title', 'content': 'Body'}) == 'Title Title Body'
+    assert pipeline._prepare_text_for_analysis({'description': 'Only description'}) == 'Only description'
+    assert pipeline._prepare_text_for_analysis({}) == ''
+
+
 def test_lambda_handler_scheduled_event():
     """Test Lambda handler with scheduled event."""
     event = {
@@ -208,6 +366,7 @@ def test_lambda_handler_scheduled_event():
         response = lambda_handler(event, context)
 
         assert response['statusCode'] == 200
+        assert json.loads(response['body']) == {'success': True, 'articles_processed': 5}
         mock_pipeline.process_pipeline.assert_called_once_with(event_type='scheduled')
 
 
@@ -230,6 +389,21 @@ def test_lambda_handler_manual_event():
         mock_pipeline.process_pipeline.assert_called_once_with(event_type='manual')
 
 
+def test_lambda_handler_reuses_pipeline_across_invocations():
+    """Test the pipeline is only built on the first (cold) invocation."""
+    event = {'source': 'aws.events'}
+    context = Mock()
+
+    with patch('src.lambda_handler.SentimentFinancePipeline') as mock_pipeline_class:
+        mock_pipeline_class.return_value.process_pipeline.return_value = {'success': True}
+
+        lambda_handler(event, context)
+        lambda_handler(event, context)
+
+        mock_pipeline_class.assert_called_once()
+        assert mock_pipeline_class.return_value.process_pipeline.call_count == 2
+
+
 def test_lambda_handler_error():
     """Test Lambda handler error handling."""
     event = {'source': 'aws.events'}
@@ -250,21 +424,21 @@ def test_pipeline_process_with_maintenance_cleanup(mock_pipeline_components):
 
     pipeline.db_manager.insert_company = Mock(return_value=1)
     # Return some articles so maintenance cleanup runs
-    pipeline.data_fetcher.fetch_financial_news = Mock(return_value=[{
+    pipeline.data_fetcher.fetch_all_news = Mock(return_value=[{
         'title': 'Test',
         'url': 'http://test.com',
         'published_at': datetime.now(),
         'source': 'Test',
         'company_search_term': 'Apple Inc.'
     }])
-    pipeline.data_fetcher.fetch_sector_news = Mock(return_value=[])
-    pipeline.db_manager.insert_article = Mock(return_value=1)
-    pipeline.sentiment_analyzer.analyze_sentiment = Mock(return_value={
+    pipeline.db_manager.insert_articles_bulk = Mock(return_value={'http://test.com': 1})
+    pipeline.sentiment_analyzer.analyze_batch = Mock(return_value=[{
         'sentiment_score': 0.5,
         'confidence': 0.8,
-        'sentiment_label': 'positive'
-    })
-    pipeline.db_manager.insert_sentiment_score = Mock()
+        'sentiment_label': 'positive',
+        'method': 'combined'
+    }])
+    pipeline.db_manager.insert_sentiment_scores_bulk = Mock()
     pipeline.db_manager.cleanup_old_articles = Mock(return_value=25)
 
     result = pipeline.process_pipeline('maintenance')
@@ -273,19 +447,22 @@ def test_pipeline_process_with_maintenance_cleanup(mock_pipeline_components):
     assert result['old_articles_deleted'] == 25
     assert result['old_articles_deleted'] == 25
     pipeline.db_manager.cleanup_old_articles.assert_called_once_with(days_to_keep=90)
+    # The rollup drops days past retention and is rebuilt after the cleanup
+    pipeline.db_manager.prune_daily_rollup.assert_called_once_with(days_to_keep=90)
+    assert pipeline.db_manager.method_calls[-1] == call.refresh_daily_rollup(days=7)
 
 
 def test_pipeline_error_handling_in_article_processing(mock_pipeline_components):
     """Test error handling when processing individual articles fails."""
     pipeline = SentimentFinancePipeline()
 
-    pipeline.db_manager.insert_article = Mock(side_effect=Exception('DB error'))
-    pipeline.sentiment_analyzer.analyze_sentiment = Mock(return_value={
+    pipeline.db_manager.insert_articles_bulk = Mock(side_effect=Exception('DB error'))
+    pipeline.sentiment_analyzer.analyze_batch = Mock(return_value=[{
         'sentiment_score': 0.5,
         'confidence': 0.8,
         'sentiment_label': 'positive',
         'method': 'combined'
-    })
+    }])
 
     articles = [
         {
@@ -305,6 +482,39 @@ def test_pipeline_error_handling_in_article_processing(mock_pipeline_components)
     assert processed == 0  # No articles successfully processed
 
 
+def test_pipeline_process_articles_in_batches(mock_pipeline_components):
+    """Test articles are written with one bulk insert per batch."""
+    pipeline = SentimentFinancePipeline()
+
+    articles = [
+        {
+            'title': f'Test {i}',
+            'url': f'https://example.com/{i}',
+            'source': 'Test',
+            'published_at': datetime.now(),
+            'company_search_term': 'Apple Inc.'
+        }
+        for i in range(3)
+    ]
+    pipeline.db_manager.insert_articles_bulk = Mock(
+        side_effect=lambda rows, connection: {row['url']: i for i, row in enumerate(rows, 1)}
+    )
+    pipeline.sentiment_analyzer.analyze_batch = Mock(side_effect=lambda texts: [{
+        'sentiment_score': 0.5,
+        'confidence': 0.8,
+        'sentiment_label': 'positive',
+        'method': 'combined'
+    } for _ in texts])
+
+    with patch('src.lambda_handler._BATCH_SIZE', 2):
+        processed = pipeline._process_articles(articles, {'Apple Inc.': 1})
+
+    assert processed == 3
+    assert pipeline.db_manager.insert_articles_bulk.call_count == 2
+    assert pipeline.db_manager.insert_sentiment_scores_bulk.call_count == 2
+    assert pipeline.db_manager.batch_transaction.call_count == 2
+
+
 def test_local_test_handler():
     """Test local test handler function."""
     with patch('src.lambda_handler.SentimentFinancePipeline') as mock_pipeline_class:
@@ -315,4 +525,151 @@ def test_local_test_handler():
         result = local_test_handler('scheduled')
 
         assert result['success'] is True
-        mock_pipeline.process_pipeline.assert_called_once_with(event_type='scheduled')
\ No newline at end of file
+        mock_pipeline.process_pipeline.assert_called_once_with(event_type='scheduled')
+
+
+def test_pipeline_process_articles_skips_duplicate_urls(mock_pipeline_components):
+    """Test an article fetched by several searches is stored and scored once."""
+    pipeline = SentimentFinancePipeline()
+
+    article = {
+        'title': 'Apple and Tesla rally',
+        'url': 'https://example.com/rally',
+        'source': 'Test',
+        'published_at': datetime.now()
+    }
+    pipeline.data_fetcher.fetch_all_news = Mock(return_value=[
+        dict(article, company_search_term='Apple Inc.'),
+        dict(article, company_search_term='Tesla Inc.'),
+        dict(article, company_search_term='sector:technology')
+    ])
+    pipeline.db_manager.insert_articles_bulk = Mock(return_value={'https://example.com/rally': 7})
+    pipeline.sentiment_analyzer.analyze_batch = Mock(return_value=[{
+        'sentiment_score': 0.5,
+        'confidence': 0.8,
+        'sentiment_label': 'positive',
+        'method': 'combined'
+    }])
+
+    articles = pipeline._fetch_all_news_articles()
+    processed = pipeline._process_articles(articles, {'Apple Inc.': 1, 'Tesla Inc.': 2})
+
+    assert processed == 1
+    rows = pipeline.db_manager.insert_articles_bulk.call_args[0][0]
+    assert [row['company_id'] for row in rows] == [1]
+    assert len(pipeline.sentiment_analyzer.analyze_batch.call_args[0][0]) == 1
+
+
+def test_pipeline_process_articles_skips_stored_urls(mock_pipeline_components):
+    """Test articles stored by an earlier run are neither inserted nor rescored."""
+    pipeline = SentimentFinancePipeline()
+
+    articles = [
+        {'title': 'Old story', 'url': 'https://example.com/old', 'source': 'Test',
+         'published_at': datetime.now(), 'company_search_term': 'Apple Inc.'},
+        {'title': 'New story', 'url': 'https://example.com/new', 'source': 'Test',
+         'published_at': datetime.now(), 'company_search_term': 'Apple Inc.'}
+    ]
+    pipeline.db_manager.filter_new_urls.side_effect = lambda urls: {'https://example.com/new'}
+    pipeline.db_manager.insert_articles_bulk = Mock(return_value={'https://example.com/new': 8})
+    pipeline.sentiment_analyzer.analyze_batch = Mock(return_value=[{
+        'sentiment_score': 0.1,
+        'confidence': 0.6,
+        'sentiment_label': 'neutral',
+        'method': 'combined'
+    }])
+
+    processed = pipeline._process_articles(articles, {'Apple Inc.': 1})
+
+    assert processed == 1
+    rows = pipeline.db_manager.insert_articles_bulk.call_args[0][0]
+    assert [row['url'] for row in rows] == ['https://example.com/new']
+    pipeline.db_manager.filter_new_urls.assert_called_once_with(
+        ['https://example.com/old', 'https://example.com/new'])
+
+
+def test_pipeline_warms_url_bloom_once(mock_pipeline_components):
+    """Test the URL Bloom filter is loaded on the first run only."""
+    pipeline = SentimentFinancePipeline()
+    pipeline.data_fetcher.fetch_all_news = Mock(return_value=[])
+
+    pipeline.process_pipeline('scheduled')
+    pipeline.process_pipeline('scheduled')
+
+    pipeline.db_manager.warmup_url_bloom.assert_called_once()
+
+
+@patch('src.database_manager.pooling.MySQLConnectionPool')
+def test_pipeline_bloom_miss_skips_url_lookup(mock_pool, mock_pipeline_components):
+    """Test that once warmed, new URLs are recognized without a SELECT."""
+    pipeline = SentimentFinancePipeline()
+    pipeline.db_manager = DatabaseManager(host='localhost', database='test_db',
+                                          user='test_user', password='test_pass')
+    mock_cursor = mock_pool.return_value.get_connection.return_value.cursor.return_value
+    mock_cursor.fetchmany.side_effect = [[('https://example.com/stored',)], []]
+
+    pipeline._warm_url_bloom()
+    pipeline._warm_url_bloom()
+    assert mock_cursor.execute.call_count == 1
+    mock_cursor.execute.reset_mock()
+
+    assert pipeline.db_manager.filter_new_urls(['https://example.com/new']) == {'https://example.com/new'}
+    mock_cursor.execute.assert_not_called()
+
+
+def test_pipeline_process_articles_does_not_store_unscored_articles(mock_pipeline_components):
+    """Test an article whose analysis failed is left unstored for a later retry."""
+    pipeline = SentimentFinancePipeline()
+
+    articles = [
+        {'title': f'Story {i}', 'url': f'https://example.com/{i}', 'source': 'Test',
+         'published_at': datetime.now(), 'company_search_term': 'Apple Inc.'}
+        for i in range(2)
+    ]
+    pipeline.db_manager.insert_articles_bulk = Mock(return_value={'https://example.com/1': 11})
+    pipeline.sentiment_analyzer.analyze_batch = Mock(return_value=[
+        {'method': 'error', 'score': 0.0, 'confidence': 0.0, 'label': 'neutral', 'error': 'boom'},
+        {'sentiment_score': 0.4, 'confidence': 0.7, 'sentiment_label': 'positive', 'method': 'combined'}
+    ])
+
+    processed = pipeline._process_articles(articles, {'Apple Inc.': 1})
+
+    assert processed == 1
+    rows = pipeline.db_manager.insert_articles_bulk.call_args[0][0]
+    assert [row['url'] for row in rows] == ['https://example.com/1']
+    scores = pipeline.db_manager.insert_sentiment_scores_bulk.call_args[0][0]
+    assert [score['article_id'] for score in scores] == [11]
+
+
+def test_pipeline_process_articles_isolates_failing_row(mock_pipeline_components):
+    """Test one row the database rejects does not stop the rest of its batch."""
+    pipeline = SentimentFinancePipeline()
+
+    articles = [
+        {'title': f'Story {i}', 'url': f'https://example.com/{i}', 'source': 'Test',
+         'published_at': datetime.now(), 'company_search_term': 'Apple Inc.'}
+        for i in range(4)
+    ]
+
+    def insert_articles_bulk(rows, connection):
+        if any(row['url'] == 'https://example.com/2' for row in rows):
+            raise Exception('Data too long for column url')
+        return {row['url']: int(row['url'][-1]) + 10 for row in rows}
+
+    pipeline.db_manager.insert_articles_bulk = Mock(side_effect=insert_articles_bulk)
+    pipeline.sentiment_analyzer.analyze_batch = Mock(side_effect=lambda texts: [{
+        'sentiment_score': 0.5,
+        'confidence': 0.8,
+        'sentiment_label': 'positive',
+        'method': 'combined'
+    } for _ in texts])
+
+    processed = pipeline._process_articles(articles, {'Apple Inc.': 1})
+
+    assert processed == 3
+    # One failed bulk attempt, then one insert per article
+    assert pipeline.db_manager.insert_articles_bulk.call_count == 5
+    assert pipeline.db_manager.savepoint.call_count == 4
+    stored = [call.args[0][0]['article_id']
+              for call in pipeline.db_manager.insert_sentiment_scores_bulk.call_args_list]
+    assert stored == [10, 11, 13]
@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import patch
 from src.sentiment_analyzer import SentimentAnalyzer
 
 
@@ -28,3 +29,36 @@ def test_sentiment_analyzer_empty():
     assert result['label'] == 'neutral'
     assert result['score'] == 0.0
     assert result['confidence'] == 0.0
+
+
+def test_batch():
+    sa = SentimentAnalyzer()
+    texts = [
+        "The company reported record profits and strong growth this quarter.",
+        "",
+        "The company reported record profits and strong growth this quarter.",
+        "Shares fell after the company missed earnings."
+    ]
+    results = sa.analyze_batch(texts, workers=1)
+    assert len(results) == len(texts)
+    assert [r['text_index'] for r in results] == [0, 1, 2, 3]
+    for result in (results[0], results[2], results[3]):
+        assert isinstance(result['sentiment_score'], float)
+        assert result['sentiment_label'] in ('positive', 'negative', 'neutral')
+    # Repeated texts share a cached score but not the result dict
+    assert results[0]['sentiment_score'] == results[2]['sentiment_score']
+    assert results[0] is not results[2]
+    assert results[1]['label'] == 'neutral'
+
+
+def test_models_load_on_first_use():
+    with patch('src.sentiment_analyzer.SentimentIntensityAnalyzer') as mock_vader:
+        mock_vader.return_value.polarity_scores.return_value = {
+            'compound': 0.5, 'pos': 0.5, 'neu': 0.5, 'neg': 0.0
+        }
+        sa = SentimentAnalyzer()
+        mock_vader.assert_not_called()
+
+        sa.analyze_sentiment("Revenue growth beat expectations.")
+        sa.analyze_sentiment("Margins improved again.")
+        mock_vader.assert_called_once()